@@ -5,17 +5,14 @@ products to the cart, verifying the cart badge,and validating the cart page cont
 """
 
 # Importing necessary libraries
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 
 # Importing exception handling classes
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
 
 # Importing WebDriver wait utilities
-from selenium.webdriver.support.wait import WebDriverWait
+from Utilities.latency_profile import AdaptiveWait
 from selenium.webdriver.support import expected_conditions as EC
 
 # Importing random module for product selection
@@ -25,7 +22,10 @@ import random
 from TestLocators.locators import SwagLabsLocators
 from TestData.data import SwagLabsData
 from PageObjects.LoginPage import SwagLabsLoginPage
+from Utilities.browser_daemon import create_driver
+from Utilities.command_counter import command_counter, count_commands
 
+@count_commands
 class SwagLabsCartPage(SwagLabsLoginPage):
     """
     SwagLabsCartPage class provides methods to interact with the cart functionality
@@ -38,9 +38,10 @@ class SwagLabsCartPage(SwagLabsLoginPage):
         Initializes the WebDriver if not already initialized.
         """
         if SwagLabsCartPage.driver is None:
-            SwagLabsCartPage.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+            SwagLabsCartPage.driver = create_driver()  # Warm daemon browser if enabled, otherwise a new one
+            command_counter.install(SwagLabsCartPage.driver)  # Count WebDriver commands per method
         self.driver = SwagLabsCartPage.driver
-        self.wait = WebDriverWait(self.driver, 15)  # Explicit wait instance
+        self.wait = AdaptiveWait(self.driver, SwagLabsData.username, 15)  # Explicit wait instance, learns per-user timeouts
 
     def start(self):
         """
@@ -61,7 +62,7 @@ class SwagLabsCartPage(SwagLabsLoginPage):
 
         try:
             # Wait for the cart button to become visible
-            cart_button = self.wait.until(EC.visibility_of_element_located((By.CLASS_NAME, SwagLabsLocators.cart_link_locator)))
+            cart_button = self.wait.until_located(EC.visibility_of_element_located, (By.CLASS_NAME, SwagLabsLocators.cart_link_locator), after_navigation=True, check_banner=True)
 
             # Check if the cart button is displayed
             if cart_button.is_displayed():
@@ -87,7 +88,7 @@ class SwagLabsCartPage(SwagLabsLoginPage):
 
         try:
             # Wait for inventory items to load
-            self.wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, SwagLabsLocators.inventory_item_locator)))
+            self.wait.until_located(EC.presence_of_all_elements_located, (By.CLASS_NAME, SwagLabsLocators.inventory_item_locator), after_navigation=True, check_banner=True)
 
             # Fetch product details from the inventory
             product_elements = self.driver.find_elements(By.CLASS_NAME, SwagLabsLocators.inventory_item_locator)
@@ -97,8 +98,8 @@ class SwagLabsCartPage(SwagLabsLoginPage):
                 print("FAIL: Inventory does not have exactly six products.")
                 return False
 
-            # Randomly select 4 products
-            selected_products = random.sample(product_elements, 4)
+            # Randomly select 4 products, kept in inventory order so the cart and checkout pages list them the same way
+            selected_products = [product_elements[i] for i in sorted(random.sample(range(len(product_elements)), 4))]
 
             # Print details of randomly selected products
             print("\nDetails of 4 randomly selected products are:")
@@ -130,7 +131,7 @@ class SwagLabsCartPage(SwagLabsLoginPage):
         """
         try:
             # Wait for the cart badge to appear
-            cart_badge = self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, SwagLabsLocators.cart_badge_locator)))
+            cart_badge = self.wait.until_located(EC.presence_of_element_located, (By.CLASS_NAME, SwagLabsLocators.cart_badge_locator))
             cart_count = int(cart_badge.text)
 
             # Check if the cart badge count is 4 (expected number of items added to the cart)
@@ -152,11 +153,11 @@ class SwagLabsCartPage(SwagLabsLoginPage):
         """
         try:
             # Click on the cart button to navigate to the cart page
-            cart_button = self.wait.until(EC.element_to_be_clickable((By.CLASS_NAME, SwagLabsLocators.cart_link_locator)))
+            cart_button = self.wait.until_located(EC.element_to_be_clickable, (By.CLASS_NAME, SwagLabsLocators.cart_link_locator))
             cart_button.click()
 
             # Wait for cart page to load
-            self.wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, SwagLabsLocators.cart_list_locator)))
+            self.wait.until_located(EC.presence_of_all_elements_located, (By.CLASS_NAME, SwagLabsLocators.cart_list_locator), after_navigation=True)
 
             # Fetch product details from the cart
             cart_products = self.driver.find_elements(By.CLASS_NAME, SwagLabsLocators.cart_item_locator)
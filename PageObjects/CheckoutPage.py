@@ -1,14 +1,12 @@
 """
 CheckoutPage.py contains Selenium scripts for interacting with the Swag Labs Checkout Page.
 This script provides functionalities such as performing the checkout process, verifying the 
-checkout overview, and capturing screenshots of the checkout page.
+checkout overview, capturing screenshots of the checkout page and comparing them against baselines.
 """
 
 # Importing necessary libraries
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
+import hashlib
 
 # Importing exception handling classes
 from selenium.common.exceptions import NoSuchElementException
@@ -16,14 +14,18 @@ from selenium.common.exceptions import ElementNotVisibleException
 from selenium.common.exceptions import TimeoutException
 
 # Importing WebDriver wait utilities
-from selenium.webdriver.support.wait import WebDriverWait
+from Utilities.latency_profile import AdaptiveWait
 from selenium.webdriver.support import expected_conditions as EC
 
 # Importing locators and test data
 from TestLocators.locators import SwagLabsLocators
 from TestData.data import SwagLabsData
 from PageObjects.CartPage import SwagLabsCartPage
+from Utilities.visual_compare import VisualComparator
+from Utilities.browser_daemon import create_driver
+from Utilities.command_counter import command_counter, count_commands
 
+@count_commands
 class SwaglabsCheckoutPage(SwagLabsCartPage):
     """
     SwaglabsCheckoutPage class provides methods to interact with the checkout functionality
@@ -37,9 +39,10 @@ class SwaglabsCheckoutPage(SwagLabsCartPage):
         Initializes the WebDriver if not already initialized.
         """
         if SwaglabsCheckoutPage.driver is None:
-            SwaglabsCheckoutPage.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+            SwaglabsCheckoutPage.driver = create_driver()  # Warm daemon browser if enabled, otherwise a new one
+            command_counter.install(SwaglabsCheckoutPage.driver)  # Count WebDriver commands per method
         self.driver = SwaglabsCheckoutPage.driver
-        self.wait = WebDriverWait(self.driver, 15)  # Explicit wait instance
+        self.wait = AdaptiveWait(self.driver, SwagLabsData.username, 15)  # Explicit wait instance, learns per-user timeouts
 
     def start(self):
         """
@@ -49,7 +52,7 @@ class SwaglabsCheckoutPage(SwagLabsCartPage):
         self.driver.get(SwagLabsData.login_url)
         return True
 
-    def checkout(self):
+    def checkout(self, real_keystrokes=None):
         """
         Performs the checkout process by adding items to the cart, filling out checkout details,
         and navigating to the checkout overview page.
@@ -60,26 +63,21 @@ class SwaglabsCheckoutPage(SwagLabsCartPage):
 
         try:
             # Click on the cart button to navigate to the cart page
-            cart_button = self.wait.until(EC.element_to_be_clickable((By.CLASS_NAME, SwagLabsLocators.cart_link_locator)))
+            cart_button = self.wait.until_located(EC.element_to_be_clickable, (By.CLASS_NAME, SwagLabsLocators.cart_link_locator))
             cart_button.click()
 
             # Wait for the cart page to load
-            self.wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, SwagLabsLocators.cart_list_locator)))
+            self.wait.until_located(EC.presence_of_all_elements_located, (By.CLASS_NAME, SwagLabsLocators.cart_list_locator), after_navigation=True)
 
             # Click the checkout button to begin the checkout process
-            checkout_button = self.wait.until(EC.element_to_be_clickable((By.ID, SwagLabsLocators.checkout_button_locator)))
+            checkout_button = self.wait.until_located(EC.element_to_be_clickable, (By.ID, SwagLabsLocators.checkout_button_locator))
             checkout_button.click()
 
-            # Enter checkout information (First Name, Last Name, Postal Code)
-            self.wait.until(EC.presence_of_element_located((By.ID, SwagLabsLocators.first_name_locator))).send_keys(SwagLabsData.first_name)
-            self.wait.until(EC.presence_of_element_located((By.ID, SwagLabsLocators.last_name_locator))).send_keys(SwagLabsData.last_name)
-            self.wait.until(EC.presence_of_element_located((By.ID, SwagLabsLocators.postal_code_locator))).send_keys(SwagLabsData.postal_code)
-
-            # Click the continue button to proceed to the overview page
-            continue_button = self.wait.until(EC.element_to_be_clickable((By.ID, SwagLabsLocators.continue_button)))
-            continue_button.click()
-
-            return True 
+            # Enter checkout information (First Name, Last Name, Postal Code) and continue to the overview page
+            fields = [(SwagLabsLocators.first_name_locator, SwagLabsData.first_name),
+                      (SwagLabsLocators.last_name_locator, SwagLabsData.last_name),
+                      (SwagLabsLocators.postal_code_locator, SwagLabsData.postal_code)]
+            return self.submit_form(fields, SwagLabsLocators.continue_button, real_keystrokes)
 
         # Handling exceptions    
         except (NoSuchElementException, ElementNotVisibleException) as error:
@@ -92,8 +90,8 @@ class SwaglabsCheckoutPage(SwagLabsCartPage):
         """
         try:
             # Locate the checkout overview section and capture a screenshot
-            checkout_overview = self.wait.until(EC.presence_of_element_located((By.ID, SwagLabsLocators.checkout_summary_locator)))
-            checkout_overview.screenshot('checkout_overview.png')
+            checkout_overview = self.wait.until_located(EC.presence_of_element_located, (By.ID, SwagLabsLocators.checkout_summary_locator), after_navigation=True, check_banner=True)
+            checkout_overview.screenshot(SwagLabsData.screenshot_file)
             print("SUCCESS: Screenshot of the checkout overview page captured.")
             return True
 
@@ -102,6 +100,26 @@ class SwaglabsCheckoutPage(SwagLabsCartPage):
             print("ERROR: Checkout overview page not found within the timeout.")
             return False
 
+    def compare_screenshot(self):
+        """
+        Compares the checkout overview screenshot against the stored baseline. Products are picked
+        randomly (4 of 6, added in inventory order), so there is one baseline per set of products,
+        15 in total. A missing baseline fails unless baselines are being updated.
+        """
+        # Build the baseline name from the products shown on the overview page
+        names = sorted(item.text for item in self.driver.find_elements(By.CLASS_NAME, SwagLabsLocators.inventory_item_name_locator))
+        key = hashlib.sha1("|".join(names).encode("utf-8")).hexdigest()[:12]
+
+        comparator = VisualComparator(SwagLabsData.baseline_dir, SwagLabsData.visual_diff_dir,
+                                      update_baselines=SwagLabsData.update_baselines)
+        result = comparator.compare(SwagLabsData.screenshot_file, name=f"checkout_overview_{key}.png")
+
+        if result.passed:
+            print(f"SUCCESS: Checkout overview matches the baseline ({result.status}, score {result.score:.6f}).")
+        else:
+            print(f"FAIL: Checkout overview differs from the baseline ({result.status}, score {result.score:.6f}, diff {result.diff_image}).")
+        return result
+
     def verify_checkout_overview(self):
         """
         Verifies that the products listed in the checkout overview match the cart contents
@@ -124,14 +142,14 @@ class SwaglabsCheckoutPage(SwagLabsCartPage):
                 print(f"Product {i + 1} verified: {name}, Price: {price}")
 
             # Click the finish button to complete the checkout
-            finish_button = self.wait.until(EC.element_to_be_clickable((By.ID, SwagLabsLocators.finish_button_locator)))
+            finish_button = self.wait.until_located(EC.element_to_be_clickable, (By.ID, SwagLabsLocators.finish_button_locator))
             finish_button.click()
 
             # Wait for the confirmation page to load
-            self.wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, SwagLabsLocators.order_confirmation_message_locator)))
+            self.wait.until_located(EC.presence_of_all_elements_located, (By.CLASS_NAME, SwagLabsLocators.order_confirmation_message_locator), after_navigation=True)
 
             # Get the confirmation message
-            confirmation_message = self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, SwagLabsLocators.order_confirmation_message_locator))).text
+            confirmation_message = self.wait.until_located(EC.presence_of_element_located, (By.CLASS_NAME, SwagLabsLocators.order_confirmation_message_locator)).text
             print(f"\nCheckout Confirmation: {confirmation_message}")
             return True
 
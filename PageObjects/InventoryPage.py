@@ -6,7 +6,7 @@ This script includes functionalities for:
 2. Logging into the Swag Labs application by extending the SwagLabsLoginPage class.
 3. Navigating the inventory page to fetch and manipulate product details.
 4. Randomly selecting products from the inventory and displaying their details.
-5. Handling exceptions and ensuring smooth script execution with WebDriverWait.
+5. Handling exceptions and ensuring smooth script execution with adaptive explicit waits.
 6. Closing the WebDriver instance to clean up resources after execution.
 
 The primary goal of this script is to facilitate automated testing and interaction with the Swag Labs Home
@@ -14,17 +14,14 @@ Page, making it easier to verify application functionality and behavior.
 """
 
 # Importing necessary libraries
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 
 # Importing exception handling classes
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
 
 # Importing WebDriver wait utilities
-from selenium.webdriver.support.wait import WebDriverWait
+from Utilities.latency_profile import AdaptiveWait
 from selenium.webdriver.support import expected_conditions as EC
 
 # Importing random module for selecting random products
@@ -34,7 +31,10 @@ import random
 from TestLocators.locators import SwagLabsLocators
 from TestData.data import SwagLabsData
 from PageObjects.LoginPage import SwagLabsLoginPage
+from Utilities.browser_daemon import create_driver
+from Utilities.command_counter import command_counter, count_commands
 
+@count_commands
 class SwagLabsInventoryPage(SwagLabsLoginPage):
     """
     This class extends SwagLabsLoginPage to include functionality specific to the Swag Labs inventory page.
@@ -47,9 +47,10 @@ class SwagLabsInventoryPage(SwagLabsLoginPage):
         Initializes the WebDriver if not already initialized.
         """
         if SwagLabsInventoryPage.driver is None:
-            SwagLabsInventoryPage.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+            SwagLabsInventoryPage.driver = create_driver()  # Warm daemon browser if enabled, otherwise a new one
+            command_counter.install(SwagLabsInventoryPage.driver)  # Count WebDriver commands per method
         self.driver = SwagLabsInventoryPage.driver
-        self.wait = WebDriverWait(self.driver, 15)  # Explicit wait instance
+        self.wait = AdaptiveWait(self.driver, SwagLabsData.username, 15)  # Explicit wait instance, learns per-user timeouts
 
     def start(self):
         """
@@ -68,7 +69,7 @@ class SwagLabsInventoryPage(SwagLabsLoginPage):
             return False
         try:
             # Wait for the inventory items to load after login
-            self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, SwagLabsLocators.inventory_item_locator)))
+            self.wait.until_located(EC.presence_of_element_located, (By.CLASS_NAME, SwagLabsLocators.inventory_item_locator), after_navigation=True, check_banner=True)
 
             # Fetch all product elements on the page
             product_elements = self.driver.find_elements(By.CLASS_NAME, SwagLabsLocators.inventory_item_locator)
@@ -1,25 +1,49 @@
 """LoginPage.py contains Selenium scripts for interacting with the Swag Labs Login Page.
 This script provides functionalities such as performing the login process, verifying logout 
-button visibility, and logging out of the application.
+button visibility, and logging out of the application. It also provides the form filling helpers
+shared by all page objects: forms are filled and submitted in a single in-page script by default,
+or typed key by key when real keystrokes are needed.
 """
 
 # Importing necessary libraries
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 
 # Importing exception handling classes
+from selenium.common.exceptions import JavascriptException
 from selenium.common.exceptions import TimeoutException
 
 # Importing WebDriver wait utilities
-from selenium.webdriver.support.wait import WebDriverWait
+from Utilities.latency_profile import AdaptiveWait
 from selenium.webdriver.support import expected_conditions as EC
 
-# Importing locators, test data
+# Importing locators, test data and the WebDriver command counter
 from TestLocators.locators import SwagLabsLocators
 from TestData.data import SwagLabsData
+from Utilities.browser_daemon import create_driver
+from Utilities.command_counter import command_counter, count_commands
 
+# Fills the given input fields and clicks the submit button in one round trip. The value is set through
+# the native input setter and "input"/"change" events are dispatched so React picks up the new values.
+# Returns the ID of the first element that could not be found, or null on success.
+FILL_FORM_SCRIPT = """
+const [fields, submitId] = arguments;
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+for (const [id, value] of fields) {
+    const input = document.getElementById(id);
+    if (!input) return id;
+    input.focus();
+    setValue.call(input, value);
+    input.dispatchEvent(new Event('input', { bubbles: true }));
+    input.dispatchEvent(new Event('change', { bubbles: true }));
+    input.blur();
+}
+const button = document.getElementById(submitId);
+if (!button) return submitId;
+button.click();
+return null;
+"""
+
+@count_commands
 class SwagLabsLoginPage:
     """
     This class contains methods to automate login-related functionality on the Swag Labs application.
@@ -32,8 +56,9 @@ class SwagLabsLoginPage:
         Initializes the WebDriver if not already initialized.
         """
         if SwagLabsLoginPage.driver is None:
-            SwagLabsLoginPage.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-        self.wait = WebDriverWait(SwagLabsLoginPage.driver, 10) # Explicit wait instance
+            SwagLabsLoginPage.driver = create_driver()  # Warm daemon browser if enabled, otherwise a new one
+            command_counter.install(SwagLabsLoginPage.driver)  # Count WebDriver commands per method
+        self.wait = AdaptiveWait(SwagLabsLoginPage.driver, SwagLabsData.username, 10) # Explicit wait instance, learns per-user timeouts
 
     def start(self):
         """
@@ -43,16 +68,51 @@ class SwagLabsLoginPage:
         self.driver.get(SwagLabsData.login_url)
         return True
 
-    def login(self):
+    def submit_form(self, fields, submit_locator, real_keystrokes=None):
+        """
+        Fills the (ID locator, value) pairs in `fields` and clicks the submit button. Uses a single
+        in-page script unless real keystrokes are requested (defaults to SwagLabsData.real_keystrokes).
+        """
+        if real_keystrokes is None:
+            real_keystrokes = SwagLabsData.real_keystrokes
+        if real_keystrokes:
+            return self.type_form(fields, submit_locator)
+        return self.fill_form(fields, submit_locator)
+
+    def type_form(self, fields, submit_locator):
+        """
+        Types into each field and clicks the submit button, one wait and command per action.
+        """
+        for index, (locator, value) in enumerate(fields):
+            self.wait.until_located(EC.presence_of_element_located, (By.ID, locator), after_navigation=index == 0).send_keys(value)
+        self.wait.until_located(EC.element_to_be_clickable, (By.ID, submit_locator)).click()
+        return True
+
+    def fill_form(self, fields, submit_locator):
+        """
+        Waits for the form, then fills all fields and clicks the submit button in one script call.
+        """
+        self.wait.until_located(EC.presence_of_element_located, (By.ID, fields[0][0]), after_navigation=True)
+        try:
+            missing = self.driver.execute_script(FILL_FORM_SCRIPT, [list(field) for field in fields], submit_locator)
+        except JavascriptException as error:
+            print(f"ERROR: Script error while filling the form - {error}")
+            return False
+
+        if missing:
+            print(f"ERROR: Form element '{missing}' not found.")
+            return False
+        return True
+
+    def login(self, real_keystrokes=None):
         """
         Logs into the application using provided credentials.
         """
         try:
             # Enter username and password, then click the login button
-            self.wait.until(EC.presence_of_element_located((By.ID, SwagLabsLocators.username_locator))).send_keys(SwagLabsData.username)
-            self.wait.until(EC.presence_of_element_located((By.ID, SwagLabsLocators.password_locator))).send_keys(SwagLabsData.password)
-            self.wait.until(EC.element_to_be_clickable((By.ID, SwagLabsLocators.login_button_locator))).click()
-            return True
+            fields = [(SwagLabsLocators.username_locator, SwagLabsData.username),
+                      (SwagLabsLocators.password_locator, SwagLabsData.password)]
+            return self.submit_form(fields, SwagLabsLocators.login_button_locator, real_keystrokes)
 
 
         except TimeoutException as error:
@@ -66,9 +126,9 @@ class SwagLabsLoginPage:
         """
         try:
             # Check visibility of the logout button via the menu
-            menu_button = self.wait.until(EC.element_to_be_clickable((By.ID, SwagLabsLocators.menu_button_locator)))
+            menu_button = self.wait.until_located(EC.element_to_be_clickable, (By.ID, SwagLabsLocators.menu_button_locator))
             menu_button.click()
-            logout_button = self.wait.until(EC.visibility_of_element_located((By.ID, SwagLabsLocators.logout_button_locator)))
+            logout_button = self.wait.until_located(EC.visibility_of_element_located, (By.ID, SwagLabsLocators.logout_button_locator))
             return logout_button.is_displayed()
        
         except TimeoutException as error:
@@ -82,7 +142,7 @@ class SwagLabsLoginPage:
         """
         try:
             # Click the logout button to log out
-            logout_button = self.wait.until(EC.element_to_be_clickable((By.ID, SwagLabsLocators.logout_button_locator)))
+            logout_button = self.wait.until_located(EC.element_to_be_clickable, (By.ID, SwagLabsLocators.logout_button_locator))
             logout_button.click()
             return True
 
@@ -6,6 +6,11 @@ The class `SwagLabsData` acts as a central repository for storing:
 - File path of the Excel file that contains test data for data-driven testing.
 - The sheet name or index of the Excel sheet containing the relevant test data.
 _ User details for checkout.
+- Whether forms are typed key by key or filled in a single script call.
+- The range of data-driven test rows to run (used when the suite is sharded across workers).
+- Whether page objects attach to warm browsers of the local browser daemon, and its port.
+- Whether waits use timeouts learned per user and action, and where the latency profiles are stored.
+- Paths used by the visual comparison of the checkout overview screenshot.
 """
 
 class SwagLabsData:
@@ -19,6 +24,10 @@ class SwagLabsData:
     # Name or index of the sheet within the Excel file containing test data
     sheet_number = "TestLog"
 
+    # First and last row of the sheet to run, None runs every row from row 2 onwards
+    ddt_first_row = None
+    ddt_last_row = None
+
     # Usernam and Password
     username = 'standard_user'
     password = 'secret_sauce'
@@ -26,4 +35,21 @@ class SwagLabsData:
     # User details for checkout
     first_name = 'Lara '
     last_name = 'Croft'
-    postal_code = '9211'
\ No newline at end of file
+    postal_code = '9211'
+
+    # Type into form fields key by key (True) or fill and submit each form in one script call (False)
+    real_keystrokes = False
+
+    # Attach to warm browsers of the local browser daemon (python -m Utilities.browser_daemon start)
+    use_browser_daemon = False
+    browser_daemon_port = 47300
+
+    # Use wait timeouts learned from earlier runs per user and action, stored in this file
+    adaptive_waits = True
+    latency_profile_file = 'TestData/.cache/latency_profiles.json'
+
+    # Screenshot of the checkout overview, its baseline folder and the folder for diff images
+    screenshot_file = 'checkout_overview.png'
+    baseline_dir = 'TestData/baselines'
+    visual_diff_dir = 'Reports/visual_diffs'
+    update_baselines = False  # Store missing or changed screenshots as the new baselines (pytest --update-baselines)
\ No newline at end of file
@@ -10,6 +10,7 @@ class SwagLabsLocators:
     login_button_locator = 'login-button'  # ID locator for the login button
     menu_button_locator = 'react-burger-menu-btn'  # ID locator for the menu button
     logout_button_locator = 'logout_sidebar_link'  # ID locator for the logout dropdown
+    error_message_locator = 'h3[data-test="error"]'  # CSS Selector locator for the error banner
 
     # Locators for Inventory Page
     inventory_item_locator = 'inventory_item'  # Class Name locator for inventory items
@@ -17,13 +17,13 @@ from selenium.common.exceptions import TimeoutException
 
 
 # Importing WebDriver wait utilities
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 # Importing locators, test data, and utility functions
 from TestLocators.locators import SwagLabsLocators
 from TestData.data import SwagLabsData
 from Utilities.excel_functions import ExcelFunctions
+from Utilities.latency_profile import AdaptiveWait, ErrorBannerShown
 
 # Test class for Swag Labs data-driven testing
 class TestSwagLabsLogin:
@@ -35,7 +35,6 @@ class TestSwagLabsLogin:
 
         # Setting up the WebDriver
         self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-        self.wait = WebDriverWait(self.driver, 10)
 
         # Maximize the browser window
         self.driver.maximize_window()
@@ -55,8 +54,12 @@ class TestSwagLabsLogin:
             # Get the total number of rows with data in the Excel sheet
             total_rows = self.excel.row_count()
 
+            # Rows to run: every data row, or the range given with --ddt-rows when the suite is sharded
+            first_row = SwagLabsData.ddt_first_row or 2
+            last_row = min(SwagLabsData.ddt_last_row or total_rows, total_rows)
+
             # Loop through each row in the Excel sheet
-            for row in range(2, total_rows + 1):
+            for row in range(first_row, last_row + 1):
                 # Read username and password from the Excel sheet
                 username = self.excel.read_data(row, 5)
                 password = self.excel.read_data(row, 6)
@@ -64,15 +67,24 @@ class TestSwagLabsLogin:
                 # Validate username and password
                 if not username or not password:
                     print(f"ERROR: Missing data in row {row}. Username or password is empty.")
-                    self.excel.write_data(row, 7, datetime.today())
-                    self.excel.write_data(row, 8, datetime.now().time())
-                    self.excel.write_data(row, 9, "Test Fail - Missing Data")
+                    self.excel.write_row(row, {7: datetime.today(), 8: datetime.now().time(), 9: "Test Fail - Missing Data"})
                     continue  # Skip to the next row
 
+                # Explicit wait with timeouts learned for this user
+                self.wait = AdaptiveWait(self.driver, username, 10)
+
                 # Enter username and password into the login form
-                self.wait.until(EC.presence_of_element_located((By.ID, SwagLabsLocators.username_locator))).send_keys(username)
-                self.wait.until(EC.presence_of_element_located((By.ID, SwagLabsLocators.password_locator))).send_keys(password)
-                self.wait.until(EC.element_to_be_clickable((By.ID, SwagLabsLocators.login_button_locator))).click()
+                self.wait.until_located(EC.presence_of_element_located, (By.ID, SwagLabsLocators.username_locator), after_navigation=True).send_keys(username)
+                self.wait.until_located(EC.presence_of_element_located, (By.ID, SwagLabsLocators.password_locator)).send_keys(password)
+                self.wait.until_located(EC.element_to_be_clickable, (By.ID, SwagLabsLocators.login_button_locator)).click()
+
+                # Wait for the inventory page, stopping straight away if the login error banner is shown
+                try:
+                    self.wait.until_located(EC.presence_of_element_located, (By.CLASS_NAME, SwagLabsLocators.inventory_item_locator), after_navigation=True, check_banner=True)
+                except ErrorBannerShown as banner:
+                    print(f"FAIL: {banner.msg}")
+                except TimeoutException:
+                    print("FAIL: Inventory page did not load within the learned timeout.")
 
                 # Check for login success based on cookies and URL
                 cookies = self.driver.get_cookies()
@@ -85,14 +97,12 @@ class TestSwagLabsLogin:
                 if session_cookie:
                     print(f"SUCCESS: Login Successful for user: {session_cookie['value']}")
                     # Log success details in the Excel sheet
-                    self.excel.write_data(row, 7, datetime.today())
-                    self.excel.write_data(row, 8, datetime.now().time())
-                    self.excel.write_data(row, 9, "Test Pass")
+                    self.excel.write_row(row, {7: datetime.today(), 8: datetime.now().time(), 9: "Test Pass"})
 
                     # Log out of the application
                     try:
-                        self.wait.until(EC.presence_of_element_located((By.ID, SwagLabsLocators.menu_button_locator))).click()
-                        self.wait.until(EC.element_to_be_clickable((By.ID, SwagLabsLocators.logout_button_locator))).click()
+                        self.wait.until_located(EC.presence_of_element_located, (By.ID, SwagLabsLocators.menu_button_locator)).click()
+                        self.wait.until_located(EC.element_to_be_clickable, (By.ID, SwagLabsLocators.logout_button_locator)).click()
                         print("SUCCESS: Logged out Successfully.")
 
                     except TimeoutException:
@@ -104,18 +114,14 @@ class TestSwagLabsLogin:
                 else:
                     print(f"FAIL: Session cookie not found. Login likely failed.")
                     # Log failure details in the Excel sheet
-                    self.excel.write_data(row, 7, datetime.today())
-                    self.excel.write_data(row, 8, datetime.now().time())
-                    self.excel.write_data(row, 9, "Test Fail")
+                    self.excel.write_row(row, {7: datetime.today(), 8: datetime.now().time(), 9: "Test Fail"})
                     self.driver.refresh()  # Refresh the page for the next attempt
  
         except (NoSuchElementException, TimeoutException) as login_error:
             # Handling exceptions
             print(f"ERROR: {login_error}")
             # Log error details in the Excel sheet
-            self.excel.write_data(row, 7, datetime.today())
-            self.excel.write_data(row, 8, datetime.now().time())
-            self.excel.write_data(row, 9, f"Error: {login_error}")
+            self.excel.write_row(row, {7: datetime.today(), 8: datetime.now().time(), 9: f"Error: {login_error}"})
 
         finally:
             # Close the WebDriver
@@ -8,7 +8,7 @@ from PageObjects.LoginPage import SwagLabsLoginPage
 # Test case for verifying the login functionality
 def test_login():
     SwagLabsLoginPage().start()  # Start the browser and navigate to the login page
-    assert SwagLabsLoginPage().login()  # Attempt to log in and check if successful
+    assert SwagLabsLoginPage().login(real_keystrokes=True)  # Type the credentials and check if login is successful
     print("SUCCESS: LOGGED IN!")  # Print success message if login is successful
 
 # Test case to check if the logout button is visible after login
@@ -3,7 +3,10 @@ test_04_CartPage.py
 This file contains Selenium test scripts for testing the Swag Labs Cart Page.
 """
 
+import pytest
+
 from PageObjects.CartPage import SwagLabsCartPage
+from TestData.data import SwagLabsData
 
 # Test case for verifying cart button is visible or not
 def test_is_cart_button_visible():
@@ -13,6 +16,9 @@ def test_is_cart_button_visible():
     SwagLabsCartPage().shutdown()  # Close the browser and cleanup
 
 # Test case for adding selected products to the cart
+# Login (2 commands with the form script, 8 typed) plus 26 to pick and add 4 products = 28 or 34.
+# Retry polls of waits are not counted, so the count does not depend on how fast the pages load
+@pytest.mark.command_budget("SwagLabsCartPage.add_to_cart", max_commands=34 if SwagLabsData.real_keystrokes else 28)
 def test_add_to_cart():
     SwagLabsCartPage().start()  # Initialize the browser and open the cart page
     assert SwagLabsCartPage().add_to_cart()  # Add randomly selected products to the cart
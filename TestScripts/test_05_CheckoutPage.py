@@ -3,9 +3,15 @@ test_05_CheckoutPage.py
 This file contains Selenium test scripts for testing the Swag Labs Checkout Page.
 """
 
+import pytest
+
 from PageObjects.CheckoutPage import SwaglabsCheckoutPage
+from TestData.data import SwagLabsData
 
 # Test case for starting the checkout process
+# add_to_cart (28 or 34) plus 9 to open the cart and start the checkout plus the form (2 with the form
+# script, 10 typed) = 39 or 53. Retry polls of waits are not counted
+@pytest.mark.command_budget("SwaglabsCheckoutPage.checkout", max_commands=53 if SwagLabsData.real_keystrokes else 39)
 def test_checkout():
     SwaglabsCheckoutPage().start()  # Initialize the browser and navigate to the checkout page
     assert SwaglabsCheckoutPage().checkout()  # Start the checkout process and verify it's successful
@@ -16,6 +22,19 @@ def test_capture_screenshot():
     assert SwaglabsCheckoutPage().capture_screenshot()  # Capture a screenshot of the checkout overview page
     print("SUCCESS: SCREENSHOT CAPTURED!")  # Print confirmation message
 
+# Test case for comparing the checkout overview screenshot against its baseline
+def test_compare_screenshot(record_property):
+    result = SwaglabsCheckoutPage().compare_screenshot()  # Compare the screenshot against the stored baseline
+    record_property("visual_score", result.score)  # Add the mismatch score to the report
+    record_property("visual_status", result.status)  # Add how the comparison was decided to the report
+    if result.hash_distance is not None:
+        record_property("hash_distance", result.hash_distance)  # Add the perceptual hash distance to the report
+    if result.diff_image:
+        record_property("attachment", result.diff_image)  # Attach the diff image to the report
+    # Fail if the screenshot differs from the baseline beyond tolerance, or if there is no baseline to compare against
+    assert result.passed, f"{result.status}: {result.baseline} (record missing baselines with pytest --update-baselines)"
+    print("SUCCESS: SCREENSHOT MATCHES THE BASELINE!")  # Print confirmation message
+
 # Test case for verifying the checkout overview and product details
 def test_verify_checkout_overview():
     assert SwaglabsCheckoutPage().verify_checkout_overview()  # Verify the checkout overview and product details are correct
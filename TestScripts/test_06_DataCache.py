@@ -0,0 +1,112 @@
+"""
+test_06_DataCache.py
+This file contains tests for the compiled test data cache (Utilities/data_cache.py) used by ExcelFunctions.
+They only need openpyxl, no browser.
+"""
+
+import datetime
+import os
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from Utilities import data_cache
+from Utilities.excel_functions import ExcelFunctions
+
+
+# Creates a small workbook shaped like the TestLog sheet
+@pytest.fixture
+def workbook_file(tmp_path):
+    file_name = str(tmp_path / "testdata.xlsx")
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "TestLog"
+    sheet.append(["Sr. No.", "Username", "Password", "Date of Test", "Time of Test", "Test Result"])
+    sheet.append([1, "standard_user", "secret_sauce", None, None, None])
+    sheet.append([2, "locked_out_user", "secret_sauce", None, None, None])
+    workbook.create_sheet("Other").append(["x", 1.5, True])
+    workbook.save(file_name)
+    yield file_name
+    data_cache._loaded.clear()
+
+
+# Counts how often the workbook is parsed
+@pytest.fixture
+def compile_calls(monkeypatch):
+    calls = []
+    compile_workbook = data_cache.compile_workbook
+    monkeypatch.setattr(data_cache, "compile_workbook", lambda *args: calls.append(args) or compile_workbook(*args))
+    return calls
+
+
+# Test case for reading the same values as openpyxl
+def test_reads_match_openpyxl(workbook_file):
+    excel = ExcelFunctions(workbook_file, "TestLog")
+    sheet = load_workbook(workbook_file)["TestLog"]
+    assert excel.row_count() == sheet.max_row
+    assert excel.column_count() == sheet.max_column
+    for row in range(1, sheet.max_row + 2):
+        for column in range(1, sheet.max_column + 2):
+            assert excel.read_data(row, column) == sheet.cell(row=row, column=column).value
+    assert ExcelFunctions(workbook_file, "Other").read_data(1, 3) is True
+
+
+# Test case for parsing the workbook only once across reads and new ExcelFunctions objects
+def test_workbook_parsed_once(workbook_file, compile_calls):
+    ExcelFunctions(workbook_file, "TestLog").read_data(2, 2)
+    data_cache._loaded.clear()  # Simulates a new test session reading the cache file from disk
+    ExcelFunctions(workbook_file, "TestLog").read_data(3, 2)
+    ExcelFunctions(workbook_file, "Other").read_data(1, 1)
+    assert len(compile_calls) == 1
+
+
+# Test case for rebuilding the cache when the workbook is changed by someone else
+def test_rebuilds_when_workbook_changes(workbook_file, compile_calls):
+    excel = ExcelFunctions(workbook_file, "TestLog")
+    assert excel.read_data(2, 2) == "standard_user"
+
+    workbook = load_workbook(workbook_file)
+    workbook["TestLog"].cell(row=2, column=2).value = "problem_user"
+    workbook.save(workbook_file)
+
+    assert excel.read_data(2, 2) == "problem_user"
+    assert len(compile_calls) == 2
+
+
+# Test case for re-keying without re-parsing when only the modification time changed
+def test_touch_only_rekeys(workbook_file, compile_calls):
+    excel = ExcelFunctions(workbook_file, "TestLog")
+    excel.read_data(2, 2)
+    stat = os.stat(workbook_file)
+    os.utime(workbook_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert excel.read_data(2, 2) == "standard_user"
+    assert data_cache.load_sheet(workbook_file, "TestLog").header["mtime_ns"] == stat.st_mtime_ns + 10 ** 9
+    assert len(compile_calls) == 1
+
+
+# Test case for writing a row: one save, cache grows and holds the values as they read back from the workbook
+def test_write_row_updates_cache(workbook_file, compile_calls):
+    excel = ExcelFunctions(workbook_file, "TestLog")
+    now = datetime.datetime(2026, 10, 19, 19, 23, 7, 127815)
+    excel.write_row(3, {4: now, 5: now.time(), 6: "Test Fail"})
+    excel.write_row(5, {8: "new column"})
+
+    saved = load_workbook(workbook_file)["TestLog"]
+    assert excel.row_count() == saved.max_row == 5
+    assert excel.column_count() == saved.max_column == 8
+    for row in range(1, 6):
+        for column in range(1, 9):
+            assert excel.read_data(row, column) == saved.cell(row=row, column=column).value
+    assert excel.read_data(3, 4) == datetime.datetime(2026, 10, 19, 19, 23, 7, 128000)
+
+    # The cache stays valid for the saved workbook, so reading does not parse it again
+    data_cache._loaded.clear()
+    assert excel.read_data(3, 6) == "Test Fail"
+    assert len(compile_calls) == 1
+
+
+# Test case for a sheet that does not exist
+def test_missing_sheet(workbook_file):
+    with pytest.raises(KeyError):
+        ExcelFunctions(workbook_file, "Missing").row_count()
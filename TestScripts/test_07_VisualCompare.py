@@ -0,0 +1,112 @@
+"""
+test_07_VisualCompare.py
+This file contains tests for the screenshot comparison (Utilities/visual_compare.py).
+They only need NumPy and Pillow, no browser.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from Utilities.visual_compare import VisualComparator
+
+
+# Function to save a solid colour image, optionally with a differently coloured block
+def save_image(path, size=(40, 30), colour=(200, 200, 200), block=None, block_colour=(0, 0, 0)):
+    pixels = np.full((size[1], size[0], 3), colour, dtype=np.uint8)
+    if block:
+        x, y, width, height = block
+        pixels[y:y + height, x:x + width] = block_colour
+    Image.fromarray(pixels).save(path)
+    return str(path)
+
+
+@pytest.fixture
+def folders(tmp_path):
+    for name in ("captures", "baselines", "diffs"):
+        (tmp_path / name).mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def comparator(folders):
+    return VisualComparator(str(folders / "baselines"), str(folders / "diffs"), max_ratio=0)
+
+
+# Test case for identical captures passing without a pixel diff
+def test_identical(folders, comparator):
+    save_image(folders / "baselines" / "page.png")
+    result = comparator.compare(save_image(folders / "captures" / "page.png"))
+    assert result.passed and result.status == "identical" and result.diff_image is None
+
+
+# Test case for a missing baseline failing unless baselines are being updated
+def test_missing_baseline(folders, comparator):
+    capture = save_image(folders / "captures" / "page.png")
+    result = comparator.compare(capture)
+    assert not result.passed and result.status == "missing-baseline"
+    assert not os.path.exists(result.baseline)
+
+    comparator.update_baselines = True
+    result = comparator.compare(capture)
+    assert result.passed and result.status == "new-baseline"
+    assert os.path.exists(result.baseline)
+
+
+# Test case for a small change failing even though the perceptual hashes may match
+def test_small_change_fails(folders, comparator):
+    save_image(folders / "baselines" / "page.png")
+    result = comparator.compare(save_image(folders / "captures" / "page.png", block=(10, 10, 2, 1)))
+    assert not result.passed and result.status == "compared"
+    assert result.score == pytest.approx(2 / (40 * 30))
+    assert result.hash_distance is not None  # Reported next to the score, whatever its value
+    assert os.path.exists(result.diff_image)
+
+
+# Test case for changes inside ignore regions not counting
+def test_ignore_regions(folders, comparator):
+    save_image(folders / "baselines" / "page.png")
+    capture = save_image(folders / "captures" / "page.png", block=(10, 10, 5, 5))
+    result = comparator.compare(capture, ignore_regions=[(8, 8, 10, 10)])
+    assert result.passed and result.score == 0
+
+
+# Test case for a capture whose size differs from its baseline
+def test_size_mismatch(folders, comparator):
+    save_image(folders / "baselines" / "page.png", size=(40, 30))
+    result = comparator.compare(save_image(folders / "captures" / "page.png", size=(30, 40)))
+    assert not result.passed and result.status == "size-mismatch"
+
+
+# Test case for a changed capture replacing its baseline when baselines are being updated
+def test_update_changed_baseline(folders, comparator):
+    baseline = save_image(folders / "baselines" / "page.png")
+    comparator.update_baselines = True
+    result = comparator.compare(save_image(folders / "captures" / "page.png", block=(0, 0, 4, 4)))
+    assert result.passed and result.status == "baseline-updated"
+    assert comparator.compare(result.capture).status == "identical"
+    assert os.path.exists(baseline)
+
+
+# Test case for a batch of captures of different sizes: one diff per size group, results in input order
+def test_batch_groups_by_size(folders, comparator, monkeypatch):
+    sizes = [(40, 30), (20, 20), (40, 30), (20, 20), (40, 30)]
+    changed = {1, 2}
+    captures = []
+    for index, size in enumerate(sizes):
+        name = f"page_{index}.png"
+        save_image(folders / "baselines" / name, size=size)
+        captures.append(save_image(folders / "captures" / name, size=size, colour=(201, 200, 200),
+                                   block=(1, 1, 3, 3) if index in changed else None))
+
+    groups = []
+    diff_group = comparator._diff_group
+    monkeypatch.setattr(comparator, "_diff_group", lambda group, results: groups.append(len(group)) or diff_group(group, results))
+    results = comparator.compare_batch(captures)
+
+    assert sorted(groups) == [2, 3]
+    assert [os.path.basename(result.capture) for result in results] == [os.path.basename(capture) for capture in captures]
+    assert [result.passed for result in results] == [index not in changed for index in range(len(sizes))]
+    assert all(result.status == "compared" for result in results)
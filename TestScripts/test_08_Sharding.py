@@ -0,0 +1,159 @@
+"""
+test_08_Sharding.py
+This file contains tests for the lease bookkeeping of the sharding coordinator (Utilities/sharding.py).
+They run the Coordinator directly, without sockets, workers or a browser.
+"""
+
+import datetime
+import json
+import shutil
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from Utilities import data_cache
+from Utilities.sharding import Coordinator, read_log_rows
+
+UNITS = [{"id": "TestScripts/test_02_LoginPage.py", "path": "TestScripts/test_02_LoginPage.py"},
+         {"id": "TestScripts/test_01_Login.py[rows 2-3]", "path": "TestScripts/test_01_Login.py", "rows": [2, 3]}]
+
+
+@pytest.fixture
+def report_file(tmp_path):
+    return str(tmp_path / "results.jsonl")
+
+
+@pytest.fixture
+def coordinator(report_file):
+    coordinator = Coordinator(UNITS, report_file, lease_ttl=60, max_attempts=2)
+    yield coordinator
+    coordinator.report.close()
+
+
+# Function to read the records of the stream report
+def read_report(report_file):
+    with open(report_file, encoding="utf-8") as stream:
+        return [json.loads(line) for line in stream]
+
+
+# Function to build a result record as sent by a worker
+def result_record(nodeid, outcome="passed"):
+    return {"type": "result", "nodeid": nodeid, "outcome": outcome, "when": "call", "duration": 0.1, "attachments": []}
+
+
+# Function to make a lease expire straight away
+def expire(coordinator, lease_id):
+    coordinator.leases[lease_id]["deadline"] = 0
+    coordinator.expire_leases()
+
+
+# Test case for handing out every unit once and finishing when all results are merged
+def test_lease_and_complete(coordinator, report_file):
+    first_id, first_unit = coordinator.lease("worker-1")
+    second_id, second_unit = coordinator.lease("worker-2")
+    assert [first_unit, second_unit] == UNITS
+    assert coordinator.lease("worker-3") is None
+    assert coordinator.heartbeat(first_id)
+
+    assert coordinator.complete(first_id, [result_record("test_02::test_login")], 0)
+    assert not coordinator.finished.is_set()
+    assert coordinator.complete(second_id, [result_record("test_01::test_login", "failed")], 1)
+    assert coordinator.finished.is_set() and coordinator.failed
+
+    results = [record for record in read_report(report_file) if record["type"] == "result"]
+    assert [record["properties"]["worker"] for record in results] == ["worker-1", "worker-2"]
+    assert results[1]["properties"]["shard"] == UNITS[1]["id"]
+    assert coordinator.timings == {"worker-1": [1, pytest.approx(0, abs=1)], "worker-2": [1, pytest.approx(0, abs=1)]}
+
+
+# Test case for requeueing an expired lease at the front and dropping the late result of the old lease
+def test_expired_lease_is_requeued(coordinator, report_file):
+    lease_id, unit = coordinator.lease("worker-1")
+    expire(coordinator, lease_id)
+    assert not coordinator.heartbeat(lease_id)
+    assert coordinator.pending[0] == unit
+
+    new_lease_id, new_unit = coordinator.lease("worker-2")
+    assert new_unit == unit
+    assert not coordinator.complete(lease_id, [result_record("late")], 0)
+    assert coordinator.complete(new_lease_id, [result_record("on time")], 0)
+    assert not coordinator.complete(new_lease_id, [result_record("duplicate")], 0)
+
+    nodeids = [record["nodeid"] for record in read_report(report_file) if record["type"] == "result"]
+    assert nodeids == ["on time"]
+
+
+# Test case for abandoning a unit whose leases expired max_attempts times
+def test_unit_abandoned_after_max_attempts(coordinator, report_file):
+    for attempt in range(2):
+        lease_id, unit = coordinator.lease(f"worker-{attempt}")
+        assert unit == UNITS[0]
+        expire(coordinator, lease_id)
+
+    assert coordinator.pending == [UNITS[1]]
+    assert coordinator.failed and UNITS[0]["id"] in coordinator.done
+    abandoned = [record for record in read_report(report_file) if record.get("nodeid") == UNITS[0]["id"]]
+    assert abandoned[0]["outcome"] == "failed" and "abandoned" in abandoned[0]["message"]
+
+
+# Test case for reassigning the leases of a disconnected worker
+def test_release_worker(coordinator):
+    coordinator.lease("worker-1")
+    coordinator.lease("worker-2")
+    coordinator.release_worker("worker-1")
+    assert coordinator.pending == [UNITS[0]]
+    assert [lease["worker"] for lease in coordinator.leases.values()] == ["worker-2"]
+
+
+# Test case for requeueing a unit whose results cannot be merged, e.g. because the workbook is open in Excel
+def test_failed_merge_is_requeued(coordinator, report_file, monkeypatch):
+    class LockedWorkbook:
+        def write_row(self, row, values):
+            raise PermissionError("testdata.xlsx is open in another program")
+
+    monkeypatch.setattr(coordinator, "excel", LockedWorkbook())
+    for attempt in range(2):
+        lease_id, unit = coordinator.lease(f"worker-{attempt}")
+        assert not coordinator.complete(lease_id, [result_record("test_02::test_login")], 0, [[2, [[9, 1, "Test Pass"]]]])
+        assert lease_id not in coordinator.leases
+
+    # Requeued once, then abandoned after max_attempts, so the run still finishes
+    assert coordinator.pending == [UNITS[1]] and UNITS[0]["id"] in coordinator.done and coordinator.failed
+    assert [record["nodeid"] for record in read_report(report_file) if record["type"] == "result"] == [UNITS[0]["id"]]
+
+
+# Test case for writing the rows logged in a worker's copy of the workbook into the coordinator's workbook
+def test_log_rows_written_to_workbook(tmp_path, report_file):
+    excel_file = str(tmp_path / "testdata.xlsx")
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "TestLog"
+    for row in range(1, 5):
+        sheet.append([row, None, None, None, f"user_{row}", "secret_sauce", None, None, None])
+    workbook.save(excel_file)
+
+    # The worker logs rows 2 and 3 into its copy
+    worker_copy = str(tmp_path / "worker_copy.xlsx")
+    shutil.copyfile(excel_file, worker_copy)
+    logged = load_workbook(worker_copy)
+    logged["TestLog"].cell(row=2, column=7).value = datetime.datetime(2026, 10, 19, 9, 30)
+    logged["TestLog"].cell(row=2, column=8).value = datetime.time(9, 30, 5)
+    logged["TestLog"].cell(row=2, column=9).value = "Test Pass"
+    logged["TestLog"].cell(row=3, column=9).value = "Test Fail"
+    logged.save(worker_copy)
+    log_rows = json.loads(json.dumps(read_log_rows(worker_copy, 2, 3)))  # As sent over the socket
+
+    coordinator = Coordinator(UNITS[1:], report_file, excel_file=excel_file)
+    try:
+        lease_id, _ = coordinator.lease("worker-1")
+        assert coordinator.complete(lease_id, [], 0, log_rows)
+    finally:
+        coordinator.report.close()
+        data_cache._loaded.clear()
+
+    saved = load_workbook(excel_file)["TestLog"]
+    assert [[saved.cell(row=row, column=column).value for column in (7, 8, 9)] for row in (2, 3, 4)] == [
+        [datetime.datetime(2026, 10, 19, 9, 30), datetime.time(9, 30, 5), "Test Pass"],
+        [None, None, "Test Fail"],
+        [None, None, None],
+    ]
@@ -0,0 +1,98 @@
+"""
+test_09_LatencyProfile.py
+This file contains tests for the learned wait timeouts (Utilities/latency_profile.py).
+They only use the profile store, no browser.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from Utilities import latency_profile
+from Utilities.latency_profile import AdaptiveWait, LatencyProfileStore
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Saves 20 samples for one action from a separate process, like a sharding worker at session end
+SAVE_SCRIPT = """
+import sys
+from Utilities.latency_profile import LatencyProfileStore
+store = LatencyProfileStore(sys.argv[1])
+for sample in range(20):
+    store.record("standard_user", sys.argv[2], 0.1)
+store.save()
+"""
+
+
+@pytest.fixture
+def profile_file(tmp_path):
+    return str(tmp_path / "latency_profiles.json")
+
+
+# Test case for the default timeout until enough samples exist, then the learned one within its limits
+def test_learned_timeout(profile_file):
+    store = LatencyProfileStore(profile_file, min_samples=3, min_timeout=1.0)
+    for sample in range(2):
+        store.record("standard_user", "login", 0.2)
+    assert store.timeout("standard_user", "login", 10) == 10
+
+    store.record("standard_user", "login", 2.0)
+    assert store.timeout("standard_user", "login", 10) == pytest.approx(2.0 * 1.5 + 0.5)
+    assert store.timeout("standard_user", "login", 10, floor=10) == 10
+
+
+# Test case for merging the samples of earlier runs and of this run on save
+def test_save_merges(profile_file):
+    first = LatencyProfileStore(profile_file)
+    first.record("standard_user", "login", 0.3)
+    assert first.save()
+    assert not first.save()  # Nothing new to save
+
+    second = LatencyProfileStore(profile_file)
+    second.record("standard_user", "login", 0.4)
+    second.save()
+    with open(profile_file, encoding="utf-8") as profile:
+        assert json.load(profile) == {"standard_user": {"login": [0.3, 0.4]}}
+    assert not os.path.exists(f"{profile_file}.lock")
+
+
+# Test case for parallel processes saving into the same profile file without losing each other's samples
+def test_parallel_saves_keep_all_samples(profile_file):
+    processes = [subprocess.Popen([sys.executable, "-c", SAVE_SCRIPT, profile_file, f"action_{number}"], cwd=PROJECT_DIR)
+                 for number in range(6)]
+    assert [process.wait(timeout=60) for process in processes] == [0] * 6
+
+    with open(profile_file, encoding="utf-8") as profile:
+        saved = json.load(profile)["standard_user"]
+    assert sorted(saved) == [f"action_{number}" for number in range(6)]
+    assert all(len(samples) == 20 for samples in saved.values())
+
+
+# Test case for keying waits by the expected condition and the locator passed by the page object
+def test_waits_keyed_by_locator(profile_file, monkeypatch):
+    class Driver:
+        def find_element(self, by, value):
+            return f"{by}={value}"
+
+    store = LatencyProfileStore(profile_file)
+    monkeypatch.setattr(latency_profile, "latency_profiles", store)
+    wait = AdaptiveWait(Driver(), "standard_user", 10)
+    assert wait.until_located(EC.presence_of_element_located, (By.ID, "user-name")) == "id=user-name"
+    wait.until(lambda driver: True)
+    assert sorted(store.new_samples["standard_user"]) == ["presence_of_element_located(id=user-name)", "test_waits_keyed_by_locator"]
+
+
+# Test case for removing a lock file left behind by a crashed process
+def test_stale_lock_is_removed(profile_file):
+    with open(f"{profile_file}.lock", "w") as lock:
+        lock.write("12345")
+    os.utime(f"{profile_file}.lock", (0, 0))
+
+    store = LatencyProfileStore(profile_file)
+    store.record("standard_user", "login", 0.3)
+    assert store.save()
@@ -0,0 +1,90 @@
+"""
+test_10_CommandCounter.py
+This file contains tests for the WebDriver command counter (Utilities/command_counter.py).
+A fake command executor stands in for the browser.
+"""
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from Utilities import latency_profile
+from Utilities.command_counter import CommandCounter, count_commands
+from Utilities.latency_profile import AdaptiveWait, LatencyProfileStore
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+        return {"value": None}
+
+
+class FakeDriver:
+    """
+    Sends one "findElement" command per lookup; the element appears after `misses` lookups.
+    """
+
+    def __init__(self, misses=0):
+        self.command_executor = FakeExecutor()
+        self.misses = misses
+
+    def find_element(self, by, value):
+        self.command_executor.execute("findElement", {"using": by, "value": value})
+        if self.misses:
+            self.misses -= 1
+            raise NoSuchElementException()
+        return f"{by}={value}"
+
+    def find_elements(self, by, value):
+        self.command_executor.execute("findElements", {"using": by, "value": value})
+        return []
+
+
+@pytest.fixture
+def counter(monkeypatch, tmp_path):
+    counter = CommandCounter()
+    monkeypatch.setattr("Utilities.command_counter.command_counter", counter)
+    monkeypatch.setattr(latency_profile, "command_counter", counter)
+    monkeypatch.setattr(latency_profile, "latency_profiles", LatencyProfileStore(str(tmp_path / "profiles.json")))
+    return counter
+
+
+def make_page(driver):
+    @count_commands
+    class Page:
+        def __init__(self):
+            self.wait = AdaptiveWait(driver, "standard_user", 5, poll_frequency=0.01)
+
+        def open_inventory(self):
+            return self.wait.until_located(EC.presence_of_element_located, (By.ID, "inventory"), check_banner=True)
+
+    return Page()
+
+
+# Test case for counting commands per page-object method
+def test_commands_counted_per_method(counter):
+    driver = counter.install(FakeDriver())
+    assert counter.install(driver) is driver  # Installing twice does not count commands twice
+    make_page(driver).open_inventory()
+    driver.command_executor.execute("getTitle")
+
+    assert counter.stats["Page.open_inventory"].commands == 1
+    assert counter.stats["(unscoped)"].by_command == {"getTitle": [1, 0, 15, pytest.approx(0, abs=1)]}
+
+
+# Test case for counting the later polls of a wait as retries, outside the budgeted commands
+def test_retry_polls_not_budgeted(counter):
+    driver = counter.install(FakeDriver(misses=3))
+    assert make_page(driver).open_inventory() == "id=inventory"
+
+    stats = counter.stats["Page.open_inventory"]
+    assert stats.commands == 1  # First poll only
+    assert stats.retries == 3 * 2  # Three more polls, each with an error banner check
+    assert driver.command_executor.commands.count("findElement") == 4
+
+    counter.reset()
+    assert counter.stats == {} and counter.totals["Page.open_inventory"].retries == 6
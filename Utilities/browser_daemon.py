@@ -0,0 +1,368 @@
+"""
+browser_daemon.py keeps a set of warm browsers alive between pytest sessions.
+The daemon launches the browsers once and leases them to page objects over a local socket
+(one JSON message per line). A leased browser is attached to with a remote WebDriver pointing
+at the daemon's chromedriver session, so a test run skips chromedriver and browser startup.
+When the test calls quit(), or its connection drops, the browser is reset (windows, cookies,
+local/session storage) and handed back to the pool. Broken browsers are relaunched by a periodic
+health check or on demand with a hard reset, and the daemon exits after an idle timeout.
+
+Usage:
+    python -m Utilities.browser_daemon start [--size 2] [--idle-timeout 1800]
+    python -m Utilities.browser_daemon status | reset | stop
+    pytest --browser-daemon
+"""
+
+import argparse
+import json
+import socket
+import socketserver
+import threading
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from TestData.data import SwagLabsData
+
+HOST = "127.0.0.1"  # The daemon only listens on the local machine
+
+
+# Function to launch a new Chrome browser, the way the page objects always did
+def launch_browser():
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+
+
+# Function returning a WebDriver for the page objects: a warm daemon browser when enabled, otherwise a new one
+def create_driver():
+    if SwagLabsData.use_browser_daemon:
+        try:
+            driver = attach()
+            if driver is not None:
+                return driver
+        except OSError as error:
+            print(f"WARNING: Browser daemon not reachable ({error}), launching a new browser.")
+    return launch_browser()
+
+
+class WarmBrowser:
+    """
+    One browser owned by the daemon.
+    """
+
+    def __init__(self, number):
+        self.number = number  # ID of the browser within the pool
+        self.driver = launch_browser()  # WebDriver controlling the browser
+        self.leased = False  # True while a test is using the browser
+
+    def describe(self):
+        """
+        Returns what a client needs to attach to the browser session.
+        """
+        return {"id": self.number, "executor": self.driver.service.service_url, "session_id": self.driver.session_id}
+
+    def is_healthy(self):
+        """
+        Checks that the browser still answers WebDriver commands.
+        """
+        try:
+            self.driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    def reset(self):
+        """
+        Closes extra windows and clears cookies and storage. Returns False if the browser is broken.
+        """
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+
+            # Storage and cookies can only be cleared for the page that is currently open
+            if self.driver.current_url.startswith("http"):
+                self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+                self.driver.delete_all_cookies()
+            self.driver.get("about:blank")
+            return True
+
+        except WebDriverException as error:
+            print(f"ERROR: Reset of browser {self.number} failed - {error}")
+            return False
+
+    def hard_reset(self):
+        """
+        Quits the browser and launches a fresh one.
+        """
+        try:
+            self.driver.quit()
+        except WebDriverException:
+            pass
+        self.driver = launch_browser()
+        return True
+
+
+class BrowserPool:
+    """
+    Leases warm browsers to clients and tracks when the pool was last used.
+    """
+
+    def __init__(self, size):
+        self.lock = threading.Lock()
+        self.browsers = [WarmBrowser(number) for number in range(size)]
+        self.last_activity = time.time()
+
+    def acquire(self):
+        """
+        Leases an idle browser, or returns None when all browsers are in use. If a broken browser cannot
+        be relaunched, the browser goes back to the pool and the error is raised.
+        """
+        with self.lock:
+            self.last_activity = time.time()
+            for browser in self.browsers:
+                if not browser.leased:
+                    browser.leased = True
+                    break
+            else:
+                return None
+
+        try:
+            if not browser.is_healthy():
+                browser.hard_reset()
+        except Exception:
+            with self.lock:
+                browser.leased = False
+            raise
+        return browser
+
+    def release(self, browser):
+        """
+        Resets the browser (relaunching it if the reset fails) and returns it to the pool.
+        """
+        try:
+            if not browser.reset():
+                browser.hard_reset()
+        finally:
+            # A browser that could not be relaunched is relaunched again when it is next acquired
+            with self.lock:
+                browser.leased = False
+                self.last_activity = time.time()
+
+    def check_health(self):
+        """
+        Relaunches idle browsers that no longer respond.
+        """
+        for browser in self.browsers:
+            with self.lock:
+                if browser.leased:
+                    continue
+                browser.leased = True  # Keep it out of the pool while it is checked
+            try:
+                if not browser.is_healthy():
+                    print(f"WARNING: Browser {browser.number} is not responding, relaunching it.")
+                    browser.hard_reset()
+            except Exception as error:
+                print(f"ERROR: Could not relaunch browser {browser.number} - {error}")
+            finally:
+                with self.lock:
+                    browser.leased = False
+
+    def hard_reset(self):
+        """
+        Relaunches every idle browser.
+        """
+        for browser in self.browsers:
+            with self.lock:
+                if browser.leased:
+                    continue
+                browser.leased = True
+            try:
+                browser.hard_reset()
+            finally:
+                with self.lock:
+                    browser.leased = False
+
+    def is_idle(self, timeout):
+        with self.lock:
+            in_use = any(browser.leased for browser in self.browsers)
+            return not in_use and time.time() - self.last_activity > timeout
+
+    def status(self):
+        with self.lock:
+            return [{"id": browser.number, "leased": browser.leased} for browser in self.browsers]
+
+    def close(self):
+        for browser in self.browsers:
+            try:
+                browser.driver.quit()
+            except WebDriverException:
+                pass
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """
+    Serves one client connection. Browsers leased on a connection are released when it closes,
+    so a test run that crashes cannot keep a browser forever.
+    """
+
+    def handle(self):
+        held = {}  # Browser ID -> WarmBrowser leased on this connection
+        try:
+            for line in self.rfile:
+                request = json.loads(line)
+                try:
+                    reply = self.run(request.get("command"), request, held)
+                except Exception as error:
+                    # e.g. chromedriver or webdriver-manager failed while relaunching a broken browser
+                    print(f"ERROR: {request.get('command')} failed - {error}")
+                    reply = {"ok": False, "error": f"{request.get('command')} failed - {error}"}
+
+                self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+        except (OSError, ValueError):
+            pass  # Client went away or sent garbage, release what it held below
+        finally:
+            for browser in held.values():
+                try:
+                    self.server.pool.release(browser)
+                except Exception as error:
+                    print(f"ERROR: Release of browser {browser.number} failed - {error}")
+
+    def run(self, command, request, held):
+        """
+        Runs one client command and returns the reply.
+        """
+        pool = self.server.pool
+        if command == "acquire":
+            browser = pool.acquire()
+            if browser is None:
+                return {"ok": False, "error": "no idle browser"}
+            held[browser.number] = browser
+            return dict(browser.describe(), ok=True)
+        if command == "release" and request.get("id") in held:
+            pool.release(held.pop(request["id"]))
+            return {"ok": True}
+        if command == "status":
+            return {"ok": True, "browsers": pool.status()}
+        if command == "reset":
+            pool.hard_reset()
+            return {"ok": True}
+        if command == "stop":
+            threading.Thread(target=self.server.shutdown).start()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown command {command!r}"}
+
+
+class DaemonServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port, pool):
+        super().__init__((HOST, port), DaemonHandler)
+        self.pool = pool
+
+
+class AttachedDriver(webdriver.Remote):
+    """
+    Remote WebDriver attached to an existing daemon browser session instead of starting a new one.
+    quit() hands the browser back to the daemon rather than closing it.
+    """
+
+    def __init__(self, connection, lease):
+        self._connection = connection  # Socket file kept open for the duration of the lease
+        self._lease = lease  # Reply of the daemon's acquire command
+        super().__init__(command_executor=lease["executor"], options=webdriver.ChromeOptions())
+
+    def start_session(self, capabilities, *args, **kwargs):
+        self.session_id = self._lease["session_id"]
+        self.caps = {"browserName": "chrome"}
+
+    def quit(self):
+        try:
+            send(self._connection, {"command": "release", "id": self._lease["id"]})
+        except OSError:
+            pass  # The daemon releases the browser when the connection closes anyway
+        finally:
+            self._connection.close()
+
+
+# Function to send one command on an open connection and read the reply
+def send(connection, request):
+    connection.write((json.dumps(request) + "\n").encode("utf-8"))
+    connection.flush()
+    line = connection.readline()
+    if not line:
+        raise ConnectionError("browser daemon closed the connection")
+    return json.loads(line)
+
+
+# Function to open a connection to the daemon
+def connect(port=None):
+    sock = socket.create_connection((HOST, port or SwagLabsData.browser_daemon_port), timeout=60)
+    return sock.makefile("rwb")
+
+
+# Function to lease a warm browser from the daemon, returns None when none is free
+def attach(port=None):
+    connection = connect(port)
+    lease = send(connection, {"command": "acquire"})
+    if not lease.get("ok"):
+        connection.close()
+        print(f"WARNING: Browser daemon could not lease a browser ({lease.get('error')}), launching a new browser.")
+        return None
+    return AttachedDriver(connection, lease)
+
+
+# Runs the daemon until it is stopped or has been idle for too long
+def serve(port, size, idle_timeout, health_interval):
+    pool = BrowserPool(size)
+    server = DaemonServer(port, pool)
+
+    def watchdog():
+        while True:
+            time.sleep(health_interval)
+            if pool.is_idle(idle_timeout):
+                print("Browser daemon idle timeout reached, shutting down.")
+                server.shutdown()
+                return
+            pool.check_health()
+
+    threading.Thread(target=watchdog, daemon=True).start()
+    print(f"Browser daemon listening on {HOST}:{port} with {size} warm browser(s).")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        pool.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Utilities.browser_daemon", description="Warm browser daemon for local test runs.")
+    parser.add_argument("command", choices=["start", "status", "reset", "stop"])
+    parser.add_argument("--port", type=int, default=SwagLabsData.browser_daemon_port)
+    parser.add_argument("--size", type=int, default=2, help="number of warm browsers")
+    parser.add_argument("--idle-timeout", type=float, default=1800, help="seconds without use before the daemon exits")
+    parser.add_argument("--health-interval", type=float, default=30, help="seconds between health checks")
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        serve(args.port, args.size, args.idle_timeout, args.health_interval)
+        return 0
+
+    connection = connect(args.port)
+    try:
+        reply = send(connection, {"command": args.command})
+    finally:
+        connection.close()
+    print(json.dumps(reply, indent=2))
+    return 0 if reply.get("ok") else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+"""
+command_counter.py counts the WebDriver wire-protocol commands issued by each page-object method.
+The driver's command executor is wrapped so every command is timed and its request and response
+sizes are measured. Commands are attributed to every page-object method on the call stack, so
+`SwaglabsCheckoutPage.checkout` also includes the commands of the `add_to_cart` and `login` calls it makes.
+
+Commands issued by the retry polls of a wait (every poll after the first) depend on how fast the page
+loads, so they are counted separately as retries and never count against a budget.
+
+Tests declare round-trip budgets with a marker and fail when a method issues more commands than allowed:
+
+    @pytest.mark.command_budget("SwaglabsCheckoutPage.checkout", max_commands=25)
+    def test_checkout(): ...
+"""
+
+import functools
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+UNSCOPED = "(unscoped)"  # Scope name for commands issued outside any page-object method
+
+
+class CommandStats:
+    """
+    Accumulated commands, bytes and latency for one page-object method.
+    """
+
+    def __init__(self):
+        self.commands = 0  # Number of wire-protocol commands
+        self.bytes_sent = 0  # Size of the JSON request parameters
+        self.bytes_received = 0  # Size of the JSON responses
+        self.latency = 0.0  # Total round-trip time in seconds
+        self.by_command = {}  # Command name -> [count, bytes sent, bytes received, latency]
+        self.retries = 0  # Commands issued by retry polls of waits, not included in the numbers above
+
+    def add(self, command, sent, received, latency, retry=False):
+        if retry:
+            self.retries += 1
+            return
+        self.commands += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.latency += latency
+        entry = self.by_command.setdefault(command, [0, 0, 0, 0.0])
+        entry[0] += 1
+        entry[1] += sent
+        entry[2] += received
+        entry[3] += latency
+
+    def merge(self, other):
+        self.retries += other.retries
+        self.commands += other.commands
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.latency += other.latency
+        for command, (count, sent, received, latency) in other.by_command.items():
+            entry = self.by_command.setdefault(command, [0, 0, 0, 0.0])
+            entry[0] += count
+            entry[1] += sent
+            entry[2] += received
+            entry[3] += latency
+
+
+class CommandCounter:
+    """
+    Wraps WebDriver command executors and keeps per-method statistics for the current test
+    (`stats`) and for the whole session (`totals`).
+    """
+
+    def __init__(self):
+        self.stack = []  # Names of the page-object methods currently running
+        self.retrying = 0  # Depth of retry() blocks currently running
+        self.stats = {}  # Method name -> CommandStats for the current test
+        self.totals = {}  # Method name -> CommandStats for the whole session
+
+    def install(self, driver):
+        """
+        Wraps the command executor of the driver. Installing twice on the same driver is a no-op.
+        """
+        executor = driver.command_executor
+        if getattr(executor, "_command_counter", None) is self:
+            return driver
+
+        execute = executor.execute
+
+        def counted_execute(command, params=None):
+            start = time.perf_counter()
+            response = execute(command, params)
+            latency = time.perf_counter() - start
+            sent = len(json.dumps(params, default=str)) if params else 0
+            received = len(json.dumps(response, default=str)) if response else 0
+            self.record(command, sent, received, latency)
+            return response
+
+        executor.execute = counted_execute
+        executor._command_counter = self
+        return driver
+
+    def record(self, command, sent, received, latency):
+        """
+        Adds one command to every method on the call stack.
+        """
+        scopes = set(self.stack) or {UNSCOPED}
+        for scope in scopes:
+            self.stats.setdefault(scope, CommandStats()).add(command, sent, received, latency, retry=self.retrying > 0)
+        logger.debug("%s %s%s: %.1f ms, %d B sent, %d B received", " > ".join(self.stack) or UNSCOPED, command,
+                     " (retry)" if self.retrying else "", latency * 1000, sent, received)
+
+    @contextmanager
+    def scope(self, name):
+        """
+        Attributes the commands issued inside the block to `name`.
+        """
+        self.stack.append(name)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+
+    @contextmanager
+    def retry(self):
+        """
+        Counts the commands issued inside the block as retries, e.g. the later polls of a wait.
+        """
+        self.retrying += 1
+        try:
+            yield
+        finally:
+            self.retrying -= 1
+
+    def reset(self):
+        """
+        Moves the statistics of the finished test into the session totals and starts afresh.
+        """
+        for name, stats in self.stats.items():
+            self.totals.setdefault(name, CommandStats()).merge(stats)
+        self.stats = {}
+
+
+# Shared counter used by the page objects and the pytest plugin
+command_counter = CommandCounter()
+
+
+# Class decorator that attributes the commands of each public method to "<Class>.<method>"
+def count_commands(cls):
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not callable(method):
+            continue
+
+        def wrap(method, scope_name):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                with command_counter.scope(scope_name):
+                    return method(*args, **kwargs)
+            return wrapper
+
+        setattr(cls, name, wrap(method, f"{cls.__name__}.{name}"))
+    return cls
+
+
+class CommandBudgetPlugin:
+    """
+    pytest plugin that checks `command_budget` markers, records per-method command counts as test
+    properties and prints the session totals at the end of the run.
+    """
+
+    def pytest_configure(self, config):
+        config.addinivalue_line(
+            "markers",
+            "command_budget(method, max_commands=None, max_bytes=None): fail the test when the page-object "
+            "method issues more WebDriver commands (or bytes) than allowed",
+        )
+
+    @pytest.hookimpl(wrapper=True)  # New-style hook wrapper, needs pytest >= 8 (see requirements.txt)
+    def pytest_runtest_call(self, item):
+        command_counter.reset()
+        result = yield
+
+        # Record the commands issued by each method so they show up in the report
+        for name, stats in sorted(command_counter.stats.items()):
+            item.user_properties.append((f"commands:{name}", stats.commands))
+            if stats.retries:
+                item.user_properties.append((f"retries:{name}", stats.retries))
+
+        exceeded = []
+        for marker in item.iter_markers("command_budget"):
+            method = marker.args[0]
+            max_commands = marker.kwargs.get("max_commands", marker.args[1] if len(marker.args) > 1 else None)
+            max_bytes = marker.kwargs.get("max_bytes")
+            stats = command_counter.stats.get(method, CommandStats())
+            if max_commands is not None and stats.commands > max_commands:
+                exceeded.append(f"{method} issued {stats.commands} commands, budget is {max_commands}")
+            if max_bytes is not None and stats.bytes_sent + stats.bytes_received > max_bytes:
+                exceeded.append(f"{method} transferred {stats.bytes_sent + stats.bytes_received} bytes, budget is {max_bytes}")
+
+        if exceeded:
+            pytest.fail("WebDriver command budget exceeded:\n" + "\n".join(exceeded), pytrace=False)
+        return result
+
+    def pytest_terminal_summary(self, terminalreporter):
+        command_counter.reset()
+        if not command_counter.totals:
+            return
+        terminalreporter.section("WebDriver commands per page-object method")
+        for name, stats in sorted(command_counter.totals.items()):
+            terminalreporter.write_line(
+                f"{name}: {stats.commands} commands, {stats.bytes_sent} B sent, "
+                f"{stats.bytes_received} B received, {stats.latency * 1000:.0f} ms, {stats.retries} retry commands"
+            )
+            for command, (count, sent, received, latency) in sorted(stats.by_command.items(), key=lambda entry: -entry[1][0]):
+                terminalreporter.write_line(f"    {command}: {count} x, {sent + received} B, {latency * 1000 / count:.1f} ms avg")
@@ -0,0 +1,283 @@
+"""
+data_cache.py keeps a compiled copy of every sheet of an Excel workbook in a compact columnar binary file.
+Parsing an .xlsx file with openpyxl is slow, so the workbook is parsed once and each sheet is stored next
+to it in a ".cache" folder. Cache files are memory mapped and cells are decoded only when they are read.
+
+Every cache file is keyed by the workbook path, size, modification time and SHA-256 content hash. When the
+workbook changes on disk the cache is rebuilt automatically; when only the modification time changed
+(same content hash) the cached data is kept and just re-keyed.
+
+File layout (native byte order, recorded in the header):
+    b"SLDCACHE" | uint32 header length | JSON header | padding to 8 bytes
+    then per column: one type tag byte per row | (rows + 1) uint32 offsets | UTF-8 value blob
+"""
+
+import datetime
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from openpyxl import load_workbook
+from openpyxl.utils.datetime import from_excel, to_excel
+
+MAGIC = b"SLDCACHE"
+VERSION = 1
+
+# Type tags of the stored values
+NONE, STRING, INTEGER, FLOAT, BOOLEAN, DATETIME, DATE, TIME = range(8)
+
+_loaded = {}  # (workbook path, sheet name) -> CompiledSheet opened by this process
+
+
+# Function to encode one cell value as a (type tag, bytes) pair
+def encode_value(value):
+    if value is None:
+        return NONE, b""
+    if isinstance(value, bool):
+        return BOOLEAN, b"1" if value else b"0"
+    if isinstance(value, int):
+        return INTEGER, str(value).encode()
+    if isinstance(value, float):
+        return FLOAT, repr(value).encode()
+    if isinstance(value, datetime.datetime):
+        return DATETIME, value.isoformat().encode()
+    if isinstance(value, datetime.date):
+        return DATE, value.isoformat().encode()
+    if isinstance(value, datetime.time):
+        return TIME, value.isoformat().encode()
+    return STRING, str(value).encode("utf-8")
+
+
+# Function to decode a value stored by encode_value
+def decode_value(tag, data):
+    if tag == NONE:
+        return None
+    text = str(data, "utf-8")
+    if tag == INTEGER:
+        return int(text)
+    if tag == FLOAT:
+        return float(text)
+    if tag == BOOLEAN:
+        return text == "1"
+    if tag == DATETIME:
+        return datetime.datetime.fromisoformat(text)
+    if tag == DATE:
+        return datetime.date.fromisoformat(text)
+    if tag == TIME:
+        return datetime.time.fromisoformat(text)
+    return text
+
+
+# Function returning a value the way it reads back from a saved workbook: dates and times are stored as
+# Excel serial numbers, which keep millisecond precision and turn dates into datetimes
+def saved_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return from_excel(to_excel(value))
+    return value
+
+
+# Function to compute the key identifying the current version of a workbook
+def workbook_key(file_name, with_hash=True):
+    stat = os.stat(file_name)
+    key = {"source": os.path.abspath(file_name), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(file_name, "rb") as workbook:
+            for block in iter(lambda: workbook.read(1 << 20), b""):
+                digest.update(block)
+        key["sha256"] = digest.hexdigest()
+    return key
+
+
+# Function returning the path of the cache file of one sheet
+def cache_path(file_name, sheet_name):
+    source = os.path.abspath(file_name)
+    path_hash = hashlib.sha1(source.encode("utf-8")).hexdigest()[:8]
+    safe_sheet = "".join(char if char.isalnum() else "_" for char in sheet_name)
+    return os.path.join(os.path.dirname(source), ".cache", f"{os.path.basename(source)}.{safe_sheet}.{path_hash}.sheet")
+
+
+def _pad(buffer, alignment):
+    buffer.extend(b"\0" * (-len(buffer) % alignment))
+
+
+# Function to write the rows of one sheet to its cache file
+def write_sheet(file_name, sheet_name, rows, key):
+    row_total = len(rows)
+    column_total = max((len(row) for row in rows), default=0)
+
+    data = bytearray()
+    columns = []
+    for column in range(column_total):
+        tags = bytearray(row_total)
+        offsets = array("I", [0])
+        blob = bytearray()
+        for index, row in enumerate(rows):
+            tag, encoded = encode_value(row[column] if column < len(row) else None)
+            tags[index] = tag
+            blob.extend(encoded)
+            offsets.append(len(blob))
+
+        tags_at = len(data)
+        data.extend(tags)
+        _pad(data, 4)
+        offsets_at = len(data)
+        data.extend(offsets.tobytes())
+        blob_at = len(data)
+        data.extend(blob)
+        _pad(data, 8)
+        columns.append([tags_at, offsets_at, blob_at])
+
+    header = dict(key, version=VERSION, byteorder=sys.byteorder, sheet=sheet_name, rows=row_total, cols=column_total, columns=columns)
+    head = bytearray(MAGIC)
+    encoded_header = json.dumps(header).encode("utf-8")
+    head.extend(struct.pack("<I", len(encoded_header)))
+    head.extend(encoded_header)
+    _pad(head, 8)
+
+    path = cache_path(file_name, sheet_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Unmap our own copy first, an open mapping blocks replacing the file on Windows
+    previous = _loaded.pop((os.path.abspath(file_name), sheet_name), None)
+    if previous is not None:
+        previous.close()
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as cache:
+        cache.write(head)
+        cache.write(data)
+    os.replace(temporary, path)
+    return path
+
+
+# Function to parse the workbook once and compile every sheet into the cache
+def compile_workbook(file_name, key=None):
+    key = key or workbook_key(file_name)
+    workbook = load_workbook(file_name, read_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = [tuple(row) for row in sheet.iter_rows(values_only=True)]
+            write_sheet(file_name, sheet.title, rows, key)
+    finally:
+        workbook.close()
+
+
+class CompiledSheet:
+    """
+    Read-only, memory mapped view of one compiled sheet. Rows and columns are numbered from 1, like openpyxl.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as cache:
+            self.map = mmap.mmap(cache.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.map)
+        if bytes(view[:8]) != MAGIC:
+            view.release()
+            self.map.close()
+            raise ValueError(f"{path} is not a test data cache file")
+
+        (length,) = struct.unpack_from("<I", view, 8)
+        self.header = json.loads(bytes(view[12:12 + length]))
+        self.rows = self.header["rows"]
+        self.cols = self.header["cols"]
+
+        start = 12 + length + (-(12 + length) % 8)
+        self.columns = []
+        for tags_at, offsets_at, blob_at in self.header["columns"]:
+            tags = view[start + tags_at:start + tags_at + self.rows]
+            offsets = view[start + offsets_at:start + offsets_at + 4 * (self.rows + 1)].cast("I")
+            self.columns.append((tags, offsets, start + blob_at))
+        self.view = view
+
+    def matches(self, key):
+        """
+        Returns True if the cache was built from the workbook version described by `key`.
+        """
+        header = self.header
+        return (header.get("version") == VERSION and header.get("byteorder") == sys.byteorder
+                and all(header.get(name) == value for name, value in key.items()))
+
+    def value(self, row, column):
+        """
+        Decodes the value of one cell; cells outside the sheet are None.
+        """
+        if not (1 <= row <= self.rows and 1 <= column <= self.cols):
+            return None
+        tags, offsets, blob_at = self.columns[column - 1]
+        start, end = offsets[row - 1], offsets[row]
+        return decode_value(tags[row - 1], self.view[blob_at + start:blob_at + end])
+
+    def values(self):
+        """
+        Decodes the whole sheet into a list of rows.
+        """
+        return [[self.value(row, column) for column in range(1, self.cols + 1)] for row in range(1, self.rows + 1)]
+
+    def close(self):
+        for tags, offsets, _ in self.columns:
+            tags.release()
+            offsets.release()
+        self.view.release()
+        self.map.close()
+
+
+def _open(file_name, sheet_name):
+    path = cache_path(file_name, sheet_name)
+    if not os.path.exists(path):
+        return None
+    try:
+        return CompiledSheet(path)
+    except (ValueError, OSError, KeyError, struct.error):
+        return None  # Unreadable or outdated format, it gets rebuilt
+
+
+# Function returning the compiled sheet, rebuilding the cache first if the workbook has changed
+def load_sheet(file_name, sheet_name):
+    memo_key = (os.path.abspath(file_name), sheet_name)
+    sheet = _loaded.get(memo_key) or _open(file_name, sheet_name)
+    quick_key = workbook_key(file_name, with_hash=False)
+
+    if sheet is None or not sheet.matches(quick_key):
+        key = workbook_key(file_name)
+        rows = sheet.values() if sheet is not None and sheet.header.get("sha256") == key["sha256"] else None
+        if sheet is not None:
+            sheet.close()
+            _loaded.pop(memo_key, None)
+
+        if rows is not None:
+            # Same content, only the modification time changed: keep the data, refresh the key
+            write_sheet(file_name, sheet_name, rows, key)
+        else:
+            compile_workbook(file_name, key)
+        sheet = _open(file_name, sheet_name)
+        if sheet is None:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+
+    _loaded[memo_key] = sheet
+    return sheet
+
+
+# Function to apply the cells written by one workbook save to the cache, so the next read does not re-parse
+# the workbook. `cells` maps (row, column) to the written value. The cache must have been valid before the
+# workbook was saved (see ExcelFunctions.write_row).
+def update_cells(file_name, sheet_name, cells):
+    memo_key = (os.path.abspath(file_name), sheet_name)
+    sheet = _loaded.pop(memo_key, None) or _open(file_name, sheet_name)
+    if sheet is None:
+        return False
+    rows = sheet.values()
+    sheet.close()
+
+    width = max([sheet.cols] + [column for _, column in cells])
+    height = max([sheet.rows] + [row for row, _ in cells])
+    rows = [row + [None] * (width - len(row)) for row in rows]
+    rows.extend([None] * width for _ in range(height - len(rows)))
+    for (row, column), value in cells.items():
+        rows[row - 1][column - 1] = saved_value(value)
+    write_sheet(file_name, sheet_name, rows, workbook_key(file_name))
+    return True
@@ -1,39 +1,57 @@
 """
 This is a Python class file to read and write data from an Excel file using the openpyxl library.
 The class provides methods to get row and column counts, read data from specific cells, and write 
-data to specific cells.
+data to specific cells. Reads are served from the compiled cache of the sheet (see data_cache.py),
+so the workbook is only parsed again when it has changed. For writing, the workbook is loaded once and
+kept open; all cells of a row are written with a single save.
 """
 
 from openpyxl import load_workbook
 
+import os
+
+from Utilities.data_cache import load_sheet, update_cells
+
 class ExcelFunctions:
     
     # Initializes the ExcelFunctions object
     def __init__(self, file_name, sheet_name):
         self.file = file_name  # Path to the Excel file
         self.sheet = sheet_name  # Name of the sheet within the Excel file
+        self.workbook = None  # Workbook kept open for writing
+        self.saved_mtime = None  # Modification time of the file after our last save
 
     # Method to count the total number of rows of the Excel file
     def row_count(self):
-        workbook = load_workbook(self.file)  # Load the Excel workbook
-        sheet = workbook[self.sheet]  # Access the specified sheet
-        return sheet.max_row  # Return the total number of rows in the sheet
+        sheet = load_sheet(self.file, self.sheet)  # Load the compiled sheet from the cache
+        return sheet.rows  # Return the total number of rows in the sheet
 
     # Method to count the total number of columns of the Excel file
     def column_count(self):
-        workbook = load_workbook(self.file)  # Load the Excel workbook
-        sheet = workbook[self.sheet]  # Access the specified sheet
-        return sheet.max_column  # Return the total number of columns in the sheet
+        sheet = load_sheet(self.file, self.sheet)  # Load the compiled sheet from the cache
+        return sheet.cols  # Return the total number of columns in the sheet
     
     # Method to read data from a specific cell in the Excel sheet
     def read_data(self, row_number, column_number):
-        workbook = load_workbook(self.file)  # Load the Excel workbook
-        sheet = workbook[self.sheet]  # Access the specified sheet
-        return sheet.cell(row=row_number, column=column_number).value  # Return the value of the specified cell
+        sheet = load_sheet(self.file, self.sheet)  # Load the compiled sheet from the cache
+        return sheet.value(row_number, column_number)  # Return the value of the specified cell
 
     # Method to write data to a specific cell in the Excel sheet. 
     def write_data(self, row_number, column_number, data):
-        workbook = load_workbook(self.file)  # Load the Excel workbook
-        sheet = workbook[self.sheet]  # Access the specified sheet
-        sheet.cell(row=row_number, column=column_number).value = data  # Write the data to the specified cell
-        workbook.save(self.file)  # Save the changes to the Excel file
\ No newline at end of file
+        self.write_row(row_number, {column_number: data})  # Write a single cell
+
+    # Method to write several cells of one row with a single save. `values` maps column numbers to data
+    def write_row(self, row_number, values):
+        load_sheet(self.file, self.sheet)  # Make sure the cache matches the workbook before it changes
+
+        # Load the Excel workbook once, and again only if someone else changed the file since our last save
+        if self.workbook is None or os.stat(self.file).st_mtime_ns != self.saved_mtime:
+            self.workbook = load_workbook(self.file)
+        sheet = self.workbook[self.sheet]  # Access the specified sheet
+        for column_number, data in values.items():
+            sheet.cell(row=row_number, column=column_number).value = data  # Write the data to the specified cell
+        self.workbook.save(self.file)  # Save the changes to the Excel file
+        self.saved_mtime = os.stat(self.file).st_mtime_ns
+
+        # Apply the change to the cache
+        update_cells(self.file, self.sheet, {(row_number, column_number): data for column_number, data in values.items()})
\ No newline at end of file
@@ -0,0 +1,243 @@
+"""
+latency_profile.py learns how long each wait takes per user and per action, and turns that into timeouts.
+The action is the wait condition and its locator, e.g. "presence_of_element_located(class name=inventory_item)".
+Every wait records its duration for (user, action) in a profile store that is saved at the end of the run
+and merged with earlier runs. A wait that times out is recorded at its timeout: the real duration is at
+least that long, so the next learned timeout grows instead of staying too short. Once enough samples exist,
+a wait uses a high percentile of the learned durations plus headroom instead of a hard-coded timeout, so
+slow but valid users (such as performance_glitch_user) keep enough time while fast users stop waiting early.
+Waits that follow a navigation never go below their hard-coded timeout, a page load can always be slow.
+
+Waits that follow a form submit can also fail fast on the application's error banner (e.g. "Epic sadface:
+Sorry, this user has been locked out."), so rows that are expected to fail do not wait for the timeout.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.wait import WebDriverWait
+
+from TestData.data import SwagLabsData
+from TestLocators.locators import SwagLabsLocators
+from Utilities.command_counter import command_counter
+
+
+class ErrorBannerShown(TimeoutException):
+    """
+    Raised when the application shows its error banner while a wait is running. It is a
+    TimeoutException, so existing timeout handling treats it as a failed wait.
+    """
+
+
+class LatencyProfileStore:
+    """
+    Keeps the most recent wait durations per user and action, persisted as JSON.
+
+    percentile  - percentile of the learned durations used as the base timeout.
+    headroom    - factor applied to that percentile.
+    margin      - seconds added on top, to absorb jitter on very fast actions.
+    min_samples - samples needed before the learned timeout replaces the default.
+    """
+
+    def __init__(self, file_name, max_samples=200, percentile=99, headroom=1.5, margin=0.5,
+                 min_samples=5, min_timeout=1.0, max_timeout=30.0):
+        self.file = file_name
+        self.max_samples = max_samples
+        self.percentile = percentile
+        self.headroom = headroom
+        self.margin = margin
+        self.min_samples = min_samples
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.lock = threading.Lock()
+        self.samples = {}  # User -> action -> list of durations in seconds
+        self.new_samples = {}  # Samples recorded by this run, merged into the file on save
+        self.load()
+
+    def load(self):
+        """
+        Loads the profiles learned in earlier runs.
+        """
+        if os.path.exists(self.file):
+            try:
+                with open(self.file, encoding="utf-8") as profile:
+                    self.samples = json.load(profile)
+            except (OSError, ValueError) as error:
+                print(f"WARNING: Could not read latency profiles from {self.file} - {error}")
+                self.samples = {}
+        return True
+
+    def record(self, user, action, seconds):
+        """
+        Adds the duration of one wait. Timed-out waits are recorded at their timeout.
+        """
+        with self.lock:
+            for store in (self.samples, self.new_samples):
+                durations = store.setdefault(user, {}).setdefault(action, [])
+                durations.append(round(seconds, 4))
+                del durations[:-self.max_samples]
+
+    def timeout(self, user, action, default, floor=None):
+        """
+        Returns the learned timeout for the user and action, or `default` while there are too few samples.
+        The learned timeout is never lower than `floor`.
+        """
+        with self.lock:
+            durations = sorted(self.samples.get(user, {}).get(action, []))
+        if len(durations) < self.min_samples:
+            return default
+
+        # Nearest-rank percentile
+        rank = max(0, -(-len(durations) * self.percentile // 100) - 1)
+        learned = durations[rank] * self.headroom + self.margin
+        return min(max(learned, self.min_timeout, floor or 0), self.max_timeout)
+
+    @contextmanager
+    def file_lock(self, timeout=10.0, stale=60.0):
+        """
+        Holds "<file>.lock", created with O_CREAT | O_EXCL, so only one process at a time reads, merges and
+        replaces the profile file. A lock file older than `stale` seconds is left over from a crashed
+        process and is removed. Raises TimeoutError if the lock cannot be taken within `timeout` seconds.
+        """
+        lock_file = f"{self.file}.lock"
+        os.makedirs(os.path.dirname(os.path.abspath(self.file)), exist_ok=True)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                descriptor = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_file) > stale:
+                        os.remove(lock_file)
+                        continue
+                except OSError:
+                    continue  # Released in the meantime
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{lock_file} is held by another process")
+                time.sleep(0.05)
+        try:
+            os.write(descriptor, str(os.getpid()).encode())
+            os.close(descriptor)
+            yield
+        finally:
+            os.remove(lock_file)
+
+    def save(self):
+        """
+        Merges the samples of this run into the profile file. The file is re-read and replaced under a
+        lock file, so parallel workers sharing it do not overwrite each other's samples.
+        """
+        with self.lock:
+            if not self.new_samples:
+                return False
+            try:
+                with self.file_lock():
+                    merged = {}
+                    if os.path.exists(self.file):
+                        try:
+                            with open(self.file, encoding="utf-8") as profile:
+                                merged = json.load(profile)
+                        except (OSError, ValueError):
+                            merged = {}
+                    for user, actions in self.new_samples.items():
+                        for action, durations in actions.items():
+                            stored = merged.setdefault(user, {}).setdefault(action, [])
+                            stored.extend(durations)
+                            del stored[:-self.max_samples]
+
+                    temporary = f"{self.file}.{os.getpid()}.tmp"
+                    with open(temporary, "w", encoding="utf-8") as profile:
+                        json.dump(merged, profile, indent=1, sort_keys=True)
+                    os.replace(temporary, self.file)
+            except TimeoutError as error:
+                print(f"WARNING: Latency profiles not saved - {error}")
+                return False
+            self.samples = merged
+            self.new_samples = {}
+            return True
+
+
+# Shared store used by all waits of the run
+latency_profiles = LatencyProfileStore(SwagLabsData.latency_profile_file)
+
+
+# Function returning the text of the application's error banner, or None when it is not shown
+def find_error_banner(driver):
+    banners = driver.find_elements(By.CSS_SELECTOR, SwagLabsLocators.error_message_locator)
+    return banners[0].text if banners else None
+
+
+# Function returning the profile key of a wait for an expected condition on a (By, value) locator,
+# e.g. "element_to_be_clickable(id=login-button)"
+def wait_action(condition, locator):
+    by, value = locator
+    return f"{condition.__name__}({by}={value})"
+
+
+class AdaptiveWait(WebDriverWait):
+    """
+    WebDriverWait whose timeout is learned per user and action. Page objects wait with `until_located`,
+    which keys the action by the expected condition and the locator they pass. For `until` the action
+    defaults to the name of the calling method.
+
+    after_navigation - the wait follows a page load, the learned timeout never goes below `timeout`.
+    check_banner     - the wait follows a form submit, stop as soon as the error banner appears.
+    """
+
+    def __init__(self, driver, user, timeout, poll_frequency=0.5, ignored_exceptions=None):
+        super().__init__(driver, timeout, poll_frequency, ignored_exceptions)
+        self.user = user  # User whose latency profile is used
+
+    def until(self, method, message="", action=None, after_navigation=False, check_banner=False):
+        action = action or sys._getframe(1).f_code.co_name
+        if SwagLabsData.adaptive_waits:
+            timeout = latency_profiles.timeout(self.user, action, self._timeout, self._timeout if after_navigation else None)
+        else:
+            timeout = self._timeout
+
+        screen = None
+        stacktrace = None
+        start = time.monotonic()
+        end_time = start + timeout
+        first_poll = True
+        while True:
+            try:
+                # Commands of later polls depend on how fast the page is, they are counted as retries
+                with nullcontext() if first_poll else command_counter.retry():
+                    # The banner is only checked by waits that follow a submit, once the first poll failed,
+                    # so waits that succeed straight away do not issue an extra WebDriver command
+                    if check_banner and not first_poll:
+                        banner = find_error_banner(self._driver)
+                        if banner:
+                            raise ErrorBannerShown(f"{action} failed for {self.user}: {banner}")
+
+                    value = method(self._driver)
+                if value:
+                    latency_profiles.record(self.user, action, time.monotonic() - start)
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+
+            first_poll = False
+            if time.monotonic() > end_time:
+                break
+            time.sleep(self._poll)
+
+        # The wait took at least the timeout, record that so the learned timeout grows
+        latency_profiles.record(self.user, action, timeout)
+        raise TimeoutException(f"{message} ({action} as {self.user} waited {timeout:.1f} s)".strip(), screen, stacktrace)
+
+    def until_located(self, condition, locator, message="", after_navigation=False, check_banner=False):
+        """
+        Waits for an expected condition that takes a locator, e.g.
+        `until_located(EC.element_to_be_clickable, (By.ID, "login-button"))`.
+        """
+        return self.until(condition(locator), message, wait_action(condition, locator), after_navigation, check_banner)
@@ -0,0 +1,99 @@
+"""
+report_server.py serves the project folder over HTTP with support for single byte-range requests.
+Reports/viewer.html asks for byte ranges of the stream report: on every poll only the new lines are
+downloaded, and a page of results only downloads its own lines. `python -m http.server` ignores
+Range headers and always sends the whole file.
+
+Usage:
+    python -m Utilities.report_server [--port 8000] [--directory .]
+    then open http://localhost:8000/Reports/viewer.html?src=results.jsonl
+"""
+
+import argparse
+import os
+import re
+import shutil
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+RANGE_PATTERN = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """
+    SimpleHTTPRequestHandler that answers "Range: bytes=<start>-[<end>]" requests for files with
+    206 Partial Content, or 416 when the range starts past the end of the file.
+    """
+
+    range_length = None  # Bytes left to send for the current range request
+
+    def send_head(self):
+        self.range_length = None
+        match = RANGE_PATTERN.fullmatch(self.headers.get("Range", "").strip())
+        path = self.translate_path(self.path)
+        if match is None or os.path.isdir(path):
+            return super().send_head()
+
+        try:
+            source = open(path, "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        size = os.fstat(source.fileno()).st_size
+        start = int(match[1])
+        end = min(int(match[2]), size - 1) if match[2] else size - 1
+        if start >= size or end < start:
+            source.close()
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        source.seek(start)
+        self.range_length = end - start + 1
+        return source
+
+    def copyfile(self, source, outputfile):
+        if self.range_length is None:
+            return shutil.copyfileobj(source, outputfile)
+
+        # Send only the requested range, the file may have grown since the headers were sent
+        remaining = self.range_length
+        while remaining > 0:
+            block = source.read(min(remaining, 64 * 1024))
+            if not block:
+                break
+            outputfile.write(block)
+            remaining -= len(block)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Utilities.report_server", description="Serve the reports with Range support.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--bind", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--directory", default=os.getcwd(), help="folder to serve, the project folder by default")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.bind, args.port), partial(RangeRequestHandler, directory=args.directory))
+    print(f"Serving {args.directory} on http://{args.bind}:{args.port}/Reports/viewer.html?src=results.jsonl")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
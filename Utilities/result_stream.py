@@ -0,0 +1,121 @@
+"""
+result_stream.py streams test results to an append-only JSON Lines file.
+Every result is written and flushed as soon as the test finishes, so memory use stays constant
+no matter how many results a run produces, and the file can be read while the run is still going.
+Reports/viewer.html pages and filters over the file produced here.
+"""
+
+import json
+import os
+import socket
+import time
+
+
+class ResultStreamWriter:
+    """
+    Appends one JSON record per line to the stream file. The first record of a run is a
+    "run_start" header, then one "result" record per test phase, then a "run_finish" footer.
+    """
+
+    def __init__(self, file_name):
+        self.file = file_name  # Path to the JSON Lines file
+        self.handle = None  # Open file handle, line buffered
+        self.run_id = f"{socket.gethostname()}-{os.getpid()}-{int(time.time())}"
+
+    def open(self):
+        """
+        Opens the stream file for appending (creating it and its folder) and writes the run header.
+        Earlier runs stay in the file; the viewer shows the latest run.
+        """
+        folder = os.path.dirname(os.path.abspath(self.file))
+        os.makedirs(folder, exist_ok=True)
+        self.handle = open(self.file, "a", encoding="utf-8", buffering=1)
+        self.write({"type": "run_start", "run_id": self.run_id, "host": socket.gethostname(), "start": time.time()})
+        return True
+
+    def write(self, record):
+        """
+        Writes a single record as one line and flushes it to disk straight away.
+        """
+        self.handle.write(json.dumps(record, default=str, separators=(",", ":")) + "\n")
+        self.handle.flush()
+
+    def relative_path(self, path):
+        """
+        Returns `path` (absolute or relative to the working directory) relative to the folder of the
+        stream file, which is how the viewer resolves attachment links.
+        """
+        try:
+            return os.path.relpath(os.path.abspath(path), os.path.dirname(os.path.abspath(self.file))).replace(os.sep, "/")
+        except ValueError:
+            return os.path.abspath(path)  # On another drive, no relative path exists
+
+    def write_result(self, nodeid, outcome, duration, when="call", start=None, stop=None, attachments=(), message=None, **extra):
+        """
+        Writes the result of one test phase. Attachments are stored as file references only,
+        never inlined, so screenshots do not grow the stream file. Their paths are stored relative
+        to the stream file.
+        """
+        record = {
+            "type": "result",
+            "run_id": self.run_id,
+            "nodeid": nodeid,
+            "outcome": outcome,
+            "when": when,
+            "duration": round(duration, 6),
+            "start": start,
+            "stop": stop,
+            "attachments": [self.relative_path(path) for path in attachments],
+            "message": message,
+        }
+        record.update(extra)
+        self.write(record)
+
+    def close(self, exit_status=None):
+        """
+        Writes the run footer and closes the stream file.
+        """
+        if self.handle is None:
+            return False
+        self.write({"type": "run_finish", "run_id": self.run_id, "stop": time.time(), "exit_status": exit_status})
+        self.handle.close()
+        self.handle = None
+        return True
+
+
+class ResultStreamPlugin:
+    """
+    pytest plugin that feeds every finished test phase into a ResultStreamWriter.
+    Passing "call" phases are recorded; setup and teardown phases are only recorded when they
+    fail or skip, which is what the HTML report shows as well.
+    """
+
+    def __init__(self, file_name):
+        self.writer = ResultStreamWriter(file_name)
+
+    def pytest_sessionstart(self, session):
+        self.writer.open()
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call" and report.outcome == "passed":
+            return
+
+        # Tests add attachments with record_property("attachment", "<path>"), other properties are kept as-is
+        attachments = [value for name, value in report.user_properties if name == "attachment"]
+        properties = {name: value for name, value in report.user_properties if name != "attachment"}
+        message = report.longreprtext if report.outcome != "passed" else None
+
+        self.writer.write_result(
+            report.nodeid,
+            report.outcome,
+            report.duration,
+            when=report.when,
+            start=getattr(report, "start", None),
+            stop=getattr(report, "stop", None),
+            attachments=attachments,
+            message=message,
+            properties=properties,
+        )
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.writer.close(int(exitstatus))
@@ -0,0 +1,433 @@
+"""
+sharding.py splits the suite across worker processes, on this machine or on other hosts.
+The coordinator turns the suite into work units - row ranges of the data-driven test sheet and whole
+test modules from TestScripts/ (tests within a module share one browser, so a module is never split) -
+and hands them out as leases over a socket protocol (one JSON message per line).
+
+Workers run each unit with pytest and send the streamed results back, together with the rows they logged
+into their copy of the workbook, which the coordinator writes into its own workbook. A lease expires when
+its worker stops sending heartbeats or disconnects, and the unit is handed to another worker. All results
+and lease timings are merged into a single stream report (see result_stream.py and Reports/viewer.html).
+
+Usage:
+    python -m Utilities.sharding coordinator [--host 0.0.0.0] [--port 47400] [--local-workers 3]
+    python -m Utilities.sharding worker --coordinator <host>:47400
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from TestData.data import SwagLabsData
+from Utilities.data_cache import decode_value, encode_value
+from Utilities.excel_functions import ExcelFunctions
+from Utilities.result_stream import ResultStreamWriter
+
+DDT_MODULE = "TestScripts/test_01_Login.py"  # Data-driven test module, split into row ranges
+DEFAULT_PORT = 47400
+LOG_COLUMNS = (7, 8, 9)  # Date, time and result columns the data-driven test logs into
+
+
+# Function to split the suite into work units
+def build_units(rows_per_lease, test_dir="TestScripts"):
+    units = []
+    for path in sorted(glob.glob(os.path.join(test_dir, "test_*.py"))):
+        path = path.replace(os.sep, "/")
+        if path != DDT_MODULE:
+            units.append({"id": path, "path": path})
+            continue
+
+        # Data rows start at row 2, below the header row
+        total_rows = ExcelFunctions(SwagLabsData.excel_file, SwagLabsData.sheet_number).row_count()
+        for first_row in range(2, total_rows + 1, rows_per_lease):
+            last_row = min(first_row + rows_per_lease - 1, total_rows)
+            units.append({"id": f"{path}[rows {first_row}-{last_row}]", "path": path, "rows": [first_row, last_row]})
+    return units
+
+
+# Function to send one JSON message on a socket file and read the reply
+def send(connection, message):
+    connection.write((json.dumps(message, default=str) + "\n").encode("utf-8"))
+    connection.flush()
+    line = connection.readline()
+    if not line:
+        raise ConnectionError("connection closed by the coordinator")
+    return json.loads(line)
+
+
+class Coordinator:
+    """
+    Keeps the queue of pending units and the active leases, and merges the results into one report.
+    """
+
+    def __init__(self, units, report_file, lease_ttl=120, max_attempts=3, excel_file=None):
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        self.pending = list(units)  # Units waiting for a worker
+        self.leases = {}  # Lease ID -> {"unit", "worker", "deadline", "started"}
+        self.attempts = {}  # Unit ID -> number of leases handed out
+        self.done = set()  # IDs of units whose results were merged
+        self.total = len(units)
+        self.lease_ttl = lease_ttl
+        self.max_attempts = max_attempts
+        self.failed = False  # True if any unit failed or could not be run
+        self.timings = {}  # Worker name -> [units run, seconds spent]
+        self.excel = ExcelFunctions(excel_file, SwagLabsData.sheet_number) if excel_file else None  # Workbook for the logged rows
+        self.report = ResultStreamWriter(report_file)
+        self.report.open()
+        self._check_finished()
+
+    def lease(self, worker):
+        """
+        Hands the next unit to a worker, or returns None if nothing is pending right now.
+        """
+        with self.lock:
+            if not self.pending:
+                return None
+            unit = self.pending.pop(0)
+            self.attempts[unit["id"]] = self.attempts.get(unit["id"], 0) + 1
+            lease_id = uuid.uuid4().hex
+            self.leases[lease_id] = {"unit": unit, "worker": worker, "deadline": time.time() + self.lease_ttl, "started": time.time()}
+            return lease_id, unit
+
+    def heartbeat(self, lease_id):
+        """
+        Extends a lease. Returns False if the lease already expired and was handed out again.
+        """
+        with self.lock:
+            lease = self.leases.get(lease_id)
+            if lease is None:
+                return False
+            lease["deadline"] = time.time() + self.lease_ttl
+            return True
+
+    def complete(self, lease_id, records, exit_status, log_rows=()):
+        """
+        Merges the results of a finished lease into the report and writes the rows logged by the worker
+        (see read_log_rows) into the workbook. Results of expired leases are dropped. If the results cannot
+        be merged (e.g. the workbook is open in Excel), the unit is requeued like an expired lease.
+        """
+        with self.lock:
+            lease = self.leases.get(lease_id)
+            if lease is None or lease["unit"]["id"] in self.done:
+                self.leases.pop(lease_id, None)
+                return False
+
+            unit, worker = lease["unit"], lease["worker"]
+            duration = time.time() - lease["started"]
+            try:
+                self._merge(unit, worker, duration, records, exit_status, log_rows)
+            except Exception as error:
+                print(f"ERROR: Could not merge the results of {unit['id']} from {worker}, reassigning it - {error!r}")
+                self._requeue(lease_id)
+                return False
+            del self.leases[lease_id]
+
+            # pytest exit status 0 is success and 5 means no tests were collected
+            if exit_status not in (0, 5):
+                self.failed = True
+            timing = self.timings.setdefault(worker, [0, 0.0])
+            timing[0] += 1
+            timing[1] += duration
+            self.done.add(unit["id"])
+            self._check_finished()
+            return True
+
+    def _merge(self, unit, worker, duration, records, exit_status, log_rows):
+        # The workbook is written first: if that fails, nothing has been added to the report yet
+        if self.excel is not None:
+            for row, cells in log_rows:
+                self.excel.write_row(row, {column: decode_value(tag, text.encode("utf-8")) for column, tag, text in cells})
+
+        for record in records:
+            record["run_id"] = self.report.run_id
+            record["attachments"] = [self.report.relative_path(path) for path in record.get("attachments", [])]
+            record.setdefault("properties", {}).update(worker=worker, shard=unit["id"])
+            self.report.write(record)
+        self.report.write({"type": "lease", "run_id": self.report.run_id, "unit": unit["id"], "worker": worker,
+                           "duration": round(duration, 3), "exit_status": exit_status})
+
+    def release_worker(self, worker):
+        """
+        Puts the units leased by a disconnected worker back in the queue.
+        """
+        with self.lock:
+            for lease_id, lease in list(self.leases.items()):
+                if lease["worker"] == worker:
+                    print(f"WARNING: Worker {worker} disconnected, reassigning {lease['unit']['id']}.")
+                    self._requeue(lease_id)
+
+    def expire_leases(self):
+        """
+        Puts the units of leases whose deadline passed back in the queue.
+        """
+        with self.lock:
+            now = time.time()
+            for lease_id, lease in list(self.leases.items()):
+                if lease["deadline"] < now:
+                    print(f"WARNING: Lease of {lease['unit']['id']} on {lease['worker']} expired, reassigning it.")
+                    self._requeue(lease_id)
+
+    def _requeue(self, lease_id):
+        unit = self.leases.pop(lease_id)["unit"]
+        if self.attempts[unit["id"]] < self.max_attempts:
+            self.pending.insert(0, unit)
+            return
+
+        # Give up on the unit and record it as failed in the report
+        self.failed = True
+        self.report.write_result(unit["id"], "failed", 0.0, message=f"Unit abandoned after {self.max_attempts} failed leases.")
+        self.done.add(unit["id"])
+        self._check_finished()
+
+    def _check_finished(self):
+        if len(self.done) == self.total:
+            self.finished.set()
+
+    def close(self):
+        self.report.close(1 if self.failed else 0)
+        print("\nWorker timings:")
+        for worker, (units, seconds) in sorted(self.timings.items()):
+            print(f"{worker}: {units} unit(s) in {seconds:.1f} s")
+
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+    """
+    Serves one worker connection.
+    """
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        worker = None
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                kind = message.get("type")
+
+                if kind == "hello":
+                    if message.get("token") != self.server.token:
+                        self.reply({"type": "error", "error": "invalid token"})
+                        return
+                    worker = message["worker"]
+                    reply = {"type": "welcome", "lease_ttl": coordinator.lease_ttl}
+                elif worker is None:
+                    reply = {"type": "error", "error": "say hello first"}
+                elif kind == "request":
+                    lease = coordinator.lease(worker)
+                    if lease:
+                        reply = {"type": "lease", "lease_id": lease[0], "unit": lease[1]}
+                    elif coordinator.finished.is_set():
+                        reply = {"type": "done"}
+                    else:
+                        reply = {"type": "wait", "seconds": 1}
+                elif kind == "heartbeat":
+                    reply = {"type": "ok" if coordinator.heartbeat(message["lease_id"]) else "expired"}
+                elif kind == "result":
+                    coordinator.complete(message["lease_id"], message["records"], message["exit_status"], message.get("log_rows", ()))
+                    reply = {"type": "ok"}
+                else:
+                    reply = {"type": "error", "error": f"unknown message {kind!r}"}
+                self.reply(reply)
+
+        except (OSError, ValueError, KeyError) as error:
+            # Worker went away or sent garbage, its leases are reassigned below
+            print(f"WARNING: Connection of worker {worker or self.client_address} ended - {error!r}")
+        finally:
+            if worker is not None:
+                coordinator.release_worker(worker)
+
+    def reply(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, coordinator, token):
+        super().__init__(address, CoordinatorHandler)
+        self.coordinator = coordinator
+        self.token = token
+
+
+# Function returning the cells the data-driven test logged for rows first to last, as
+# [row, [[column, type tag, text], ...]] pairs that survive the JSON round trip with their types
+def read_log_rows(excel_file, first_row, last_row):
+    excel = ExcelFunctions(excel_file, SwagLabsData.sheet_number)
+    log_rows = []
+    for row in range(first_row, last_row + 1):
+        cells = []
+        for column in LOG_COLUMNS:
+            value = excel.read_data(row, column)
+            if value is not None:
+                tag, data = encode_value(value)
+                cells.append([column, tag, data.decode("utf-8")])
+        if cells:
+            log_rows.append([row, cells])
+    return log_rows
+
+
+# Runs one unit with pytest and returns (result records, exit status, logged workbook rows)
+def run_unit(unit, work_dir, pytest_args=()):
+    stream_file = os.path.join(work_dir, "results.jsonl")
+    command = [sys.executable, "-m", "pytest", unit["path"], "-p", "no:cacheprovider", f"--stream-report={stream_file}", *pytest_args]
+
+    if "rows" in unit:
+        # Every worker logs into its own copy of the workbook, so parallel workers never write the same file
+        excel_copy = os.path.join(work_dir, os.path.basename(SwagLabsData.excel_file))
+        if not os.path.exists(excel_copy):
+            shutil.copyfile(SwagLabsData.excel_file, excel_copy)
+        command += [f"--excel-file={excel_copy}", f"--ddt-rows={unit['rows'][0]}-{unit['rows'][1]}"]
+
+    exit_status = subprocess.call(command)
+    log_rows = read_log_rows(excel_copy, *unit["rows"]) if "rows" in unit else []
+
+    records = []
+    if os.path.exists(stream_file):
+        with open(stream_file, encoding="utf-8") as stream:
+            records = [record for record in map(json.loads, stream) if record.get("type") == "result"]
+        os.remove(stream_file)
+
+        # Attachment paths are relative to the stream file, make them absolute again
+        for record in records:
+            record["attachments"] = [os.path.normpath(os.path.join(work_dir, path)) for path in record.get("attachments", [])]
+
+    if not records and exit_status not in (0, 5):
+        records.append({"type": "result", "nodeid": unit["id"], "outcome": "failed", "when": "collect", "duration": 0.0,
+                        "attachments": [], "message": f"pytest exited with status {exit_status} without results."})
+    return records, exit_status, log_rows
+
+
+# Sends heartbeats for a lease every `interval` seconds until `stopped` is set or the lease expired
+def keep_alive(exchange, name, lease_id, unit_id, interval, stopped):
+    while not stopped.wait(interval):
+        try:
+            if exchange({"type": "heartbeat", "lease_id": lease_id})["type"] == "expired":
+                print(f"WARNING: Worker {name}: lease of {unit_id} expired.")
+                return
+        except (OSError, ValueError):
+            return  # The main loop reports the lost connection
+
+
+# Worker loop: requests leases until the coordinator reports that all work is done
+def work(address, name=None, token=None, pytest_args=()):
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    host, port = address
+    sock = socket.create_connection((host, port))
+    connection = sock.makefile("rwb")
+    lock = threading.Lock()  # One request/reply exchange at a time on the connection
+
+    def exchange(message):
+        with lock:
+            return send(connection, message)
+
+    welcome = exchange({"type": "hello", "worker": name, "token": token})
+    if welcome.get("type") != "welcome":
+        print(f"ERROR: Coordinator refused worker {name} - {welcome.get('error')}")
+        return 1
+
+    work_dir = tempfile.mkdtemp(prefix="swaglabs-worker-")
+    try:
+        while True:
+            reply = exchange({"type": "request"})
+            if reply["type"] == "done":
+                return 0
+            if reply["type"] == "wait":
+                time.sleep(reply["seconds"])
+                continue
+
+            lease_id, unit = reply["lease_id"], reply["unit"]
+            print(f"Worker {name}: running {unit['id']}")
+
+            # Keep the lease alive while pytest runs
+            stopped = threading.Event()
+            heartbeat = threading.Thread(target=keep_alive, args=(exchange, name, lease_id, unit["id"], welcome["lease_ttl"] / 3, stopped), daemon=True)
+            heartbeat.start()
+            try:
+                records, exit_status, log_rows = run_unit(unit, work_dir, pytest_args)
+            finally:
+                stopped.set()
+                heartbeat.join()
+            exchange({"type": "result", "lease_id": lease_id, "records": records, "exit_status": exit_status, "log_rows": log_rows})
+
+    except ConnectionError as error:
+        print(f"ERROR: Worker {name} lost the coordinator - {error}")
+        return 1
+    finally:
+        connection.close()
+        sock.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# Runs the coordinator until every unit is finished; optionally starts local worker processes
+def coordinate(host, port, report_file, rows_per_lease, lease_ttl, local_workers, token):
+    units = build_units(rows_per_lease)
+    coordinator = Coordinator(units, report_file, lease_ttl, excel_file=SwagLabsData.excel_file)
+    server = CoordinatorServer((host, port), coordinator, token)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Coordinator listening on {host}:{port} with {len(units)} unit(s).")
+
+    workers = []
+    for number in range(local_workers):
+        command = [sys.executable, "-m", "Utilities.sharding", "worker", f"--coordinator=127.0.0.1:{port}",
+                   f"--name=local-{number + 1}", f"--excel-file={SwagLabsData.excel_file}"]
+        if token:
+            command.append(f"--token={token}")
+        workers.append(subprocess.Popen(command))
+
+    try:
+        while not coordinator.finished.wait(timeout=1):
+            coordinator.expire_leases()
+    finally:
+        for worker in workers:
+            worker.wait()  # Local workers exit once they are told that all work is done
+        server.shutdown()
+        server.server_close()
+        coordinator.close()
+    return 1 if coordinator.failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Utilities.sharding", description="Shard the test suite across workers.")
+    subparsers = parser.add_subparsers(dest="role", required=True)
+
+    coordinator = subparsers.add_parser("coordinator", help="split the suite into leases and merge the results")
+    coordinator.add_argument("--host", default="127.0.0.1", help="address to listen on, 0.0.0.0 for workers on other hosts")
+    coordinator.add_argument("--port", type=int, default=DEFAULT_PORT)
+    coordinator.add_argument("--report", default="Reports/results.jsonl", help="merged stream report")
+    coordinator.add_argument("--rows-per-lease", type=int, default=10, help="data-driven test rows per lease")
+    coordinator.add_argument("--lease-ttl", type=float, default=120, help="seconds without heartbeat before a lease expires")
+    coordinator.add_argument("--local-workers", type=int, default=0, help="worker processes to start on this host")
+    coordinator.add_argument("--token", default=None, help="shared secret workers must present")
+    coordinator.add_argument("--excel-file", default=None, help="workbook with the data-driven test rows")
+
+    worker = subparsers.add_parser("worker", help="run leased units with pytest")
+    worker.add_argument("--coordinator", required=True, metavar="HOST:PORT")
+    worker.add_argument("--name", default=None)
+    worker.add_argument("--token", default=None)
+    worker.add_argument("--excel-file", default=None, help="local copy of the workbook with the data-driven test rows")
+
+    args, pytest_args = parser.parse_known_args(argv)
+    if args.excel_file:
+        SwagLabsData.excel_file = args.excel_file
+
+    if args.role == "coordinator":
+        return coordinate(args.host, args.port, args.report, args.rows_per_lease, args.lease_ttl, args.local_workers, args.token)
+
+    host, port = args.coordinator.rsplit(":", 1)
+    return work((host, int(port)), args.name, args.token, pytest_args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
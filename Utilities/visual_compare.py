@@ -0,0 +1,202 @@
+"""
+visual_compare.py compares captured screenshots against stored baseline images.
+The comparison runs in two steps, cheapest first:
+1. Byte comparison - identical files are passed straight away.
+2. NumPy vectorized pixel diff - per-pixel channel difference with a tolerance, optional
+   ignore regions for dynamic content, a mismatch score and a highlighted diff image.
+The perceptual hash (difference hash) distance is reported next to the score as a quick measure of
+how different two images look, but it never passes a capture on its own: small changes such as a
+different price can leave the hash unchanged.
+Many captures can be compared in one pass with `compare_batch`, which stacks same-sized
+images into a single array so the diff runs once for the whole group.
+
+A capture without a baseline fails, unless baselines are being updated (`update_baselines=True`,
+`pytest --update-baselines`), which stores the capture as its baseline instead.
+"""
+
+import os
+import shutil
+import sys
+
+import numpy as np
+from PIL import Image
+
+
+class VisualResult:
+    """
+    Holds the outcome of comparing one capture against its baseline.
+    """
+
+    def __init__(self, name, capture, baseline, passed, score, status, diff_image=None, hash_distance=None):
+        self.name = name  # Name of the compared image (file name without folder)
+        self.capture = capture  # Path to the captured screenshot
+        self.baseline = baseline  # Path to the baseline image
+        self.passed = passed  # True if the capture matches the baseline within tolerance
+        self.score = score  # Fraction of compared pixels that differ (0.0 - 1.0)
+        self.status = status  # "identical", "compared", "size-mismatch", "missing-baseline", "new-baseline" or "baseline-updated"
+        self.diff_image = diff_image  # Path to the written diff image, if any
+        self.hash_distance = hash_distance  # Hamming distance between the perceptual hashes, if computed
+
+    def __repr__(self):
+        return f"VisualResult({self.name!r}, status={self.status!r}, score={self.score:.6f}, passed={self.passed})"
+
+
+class VisualComparator:
+    """
+    Compares captures against baselines stored in `baseline_dir` and writes diff images to `diff_dir`.
+
+    tolerance     - maximum per-channel difference (0-255) still counted as an equal pixel.
+    max_ratio     - maximum fraction of differing pixels for the comparison to pass.
+    update_baselines - store captures without a baseline, or failing their comparison, as the new baseline.
+    """
+
+    def __init__(self, baseline_dir, diff_dir, tolerance=16, max_ratio=0.001, update_baselines=False):
+        self.baseline_dir = baseline_dir
+        self.diff_dir = diff_dir
+        self.tolerance = tolerance
+        self.max_ratio = max_ratio
+        self.update_baselines = update_baselines
+
+    # Method to compute the difference hash (size x size bits) of an image
+    @staticmethod
+    def dhash(image, size=16):
+        gray = np.asarray(image.convert("L").resize((size + 1, size), Image.BILINEAR), dtype=np.int16)
+        bits = (gray[:, 1:] > gray[:, :-1]).ravel()
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+    # Method to build a boolean mask of the pixels to compare, excluding ignore regions
+    @staticmethod
+    def region_mask(shape, ignore_regions=()):
+        mask = np.ones(shape[:2], dtype=bool)
+        for x, y, width, height in ignore_regions:
+            mask[max(y, 0):y + height, max(x, 0):x + width] = False
+        return mask
+
+    def baseline_path(self, name):
+        return os.path.join(self.baseline_dir, name)
+
+    def compare(self, capture, name=None, ignore_regions=()):
+        """
+        Compares a single capture against the baseline with the same file name (or `name`).
+        """
+        return self.compare_batch([capture], names=[name], ignore_regions=[ignore_regions])[0]
+
+    def compare_batch(self, captures, names=None, ignore_regions=None):
+        """
+        Compares many captures in one pass. Captures that are not byte-identical to their baseline
+        are grouped by image size and diffed as one stacked array per group.
+        """
+        names = names or [None] * len(captures)
+        ignore_regions = ignore_regions or [()] * len(captures)
+        results = [None] * len(captures)
+        pending = {}  # Image shape -> list of (index, name, capture, baseline, capture array, baseline array, mask, hash distance)
+
+        for index, capture in enumerate(captures):
+            name = names[index] or os.path.basename(capture)
+            baseline = self.baseline_path(name)
+
+            # No baseline yet: fail, or store the capture as the baseline when updating baselines
+            if not os.path.exists(baseline):
+                if self.update_baselines:
+                    self.store_baseline(capture, baseline)
+                    results[index] = VisualResult(name, capture, baseline, True, 0.0, "new-baseline")
+                else:
+                    results[index] = VisualResult(name, capture, baseline, False, 1.0, "missing-baseline")
+                continue
+
+            # Cheapest check: identical bytes
+            if os.path.getsize(capture) == os.path.getsize(baseline):
+                with open(capture, "rb") as first, open(baseline, "rb") as second:
+                    if first.read() == second.read():
+                        results[index] = VisualResult(name, capture, baseline, True, 0.0, "identical")
+                        continue
+
+            with Image.open(capture) as captured_image, Image.open(baseline) as baseline_image:
+                if captured_image.size != baseline_image.size:
+                    results[index] = self.mismatch(VisualResult(name, capture, baseline, False, 1.0, "size-mismatch"))
+                    continue
+
+                # Reported only, a matching hash does not mean the images are equal
+                distance = bin(self.dhash(captured_image) ^ self.dhash(baseline_image)).count("1")
+                captured_array = np.asarray(captured_image.convert("RGB"), dtype=np.uint8)
+                baseline_array = np.asarray(baseline_image.convert("RGB"), dtype=np.uint8)
+
+            mask = self.region_mask(captured_array.shape, ignore_regions[index])
+            pending.setdefault(captured_array.shape, []).append((index, name, capture, baseline, captured_array, baseline_array, mask, distance))
+
+        for group in pending.values():
+            self._diff_group(group, results)
+
+        return results
+
+    def _diff_group(self, group, results):
+        """
+        Diffs a group of same-sized images in a single vectorized operation.
+        """
+        captured = np.stack([item[4] for item in group]).astype(np.int16)
+        baseline = np.stack([item[5] for item in group]).astype(np.int16)
+        masks = np.stack([item[6] for item in group])
+
+        # Largest channel difference per pixel, then pixels above tolerance inside the compared area
+        changed = (np.abs(captured - baseline).max(axis=3) > self.tolerance) & masks
+        compared = np.maximum(masks.sum(axis=(1, 2)), 1)
+        scores = changed.sum(axis=(1, 2)) / compared
+
+        for position, (index, name, capture, baseline_path, captured_array, _, mask, distance) in enumerate(group):
+            score = float(scores[position])
+            passed = score <= self.max_ratio
+            diff_image = self.write_diff(name, captured_array, changed[position], mask) if changed[position].any() else None
+            result = VisualResult(name, capture, baseline_path, passed, score, "compared", diff_image, distance)
+            results[index] = result if passed else self.mismatch(result)
+
+    def mismatch(self, result):
+        """
+        Returns a failed result, or replaces the baseline and passes it when baselines are being updated.
+        """
+        if self.update_baselines:
+            self.store_baseline(result.capture, result.baseline)
+            result.status = "baseline-updated"
+            result.passed = True
+        return result
+
+    def store_baseline(self, capture, baseline):
+        os.makedirs(os.path.dirname(baseline) or ".", exist_ok=True)
+        shutil.copyfile(capture, baseline)
+
+    def write_diff(self, name, captured_array, changed, mask):
+        """
+        Writes a diff image: changed pixels in red over a faded capture, ignored regions greyed out.
+        """
+        os.makedirs(self.diff_dir, exist_ok=True)
+        diff = (captured_array.astype(np.uint16) + 255 * 2) // 3  # Faded copy of the capture
+        diff[~mask] = 128
+        diff[changed] = (255, 0, 0)
+        root, _ = os.path.splitext(name)
+        path = os.path.join(self.diff_dir, f"{root}_diff.png")
+        Image.fromarray(diff.astype(np.uint8)).save(path)
+        return path
+
+
+# Compares every image in a capture folder against the baseline folder in one batch
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    update_baselines = "--update-baselines" in argv
+    argv = [arg for arg in argv if arg != "--update-baselines"]
+    if len(argv) < 2:
+        print("Usage: python -m Utilities.visual_compare <capture_dir> <baseline_dir> [diff_dir] [--update-baselines]")
+        return 2
+
+    capture_dir, baseline_dir = argv[0], argv[1]
+    diff_dir = argv[2] if len(argv) > 2 else os.path.join("Reports", "visual_diffs")
+    captures = sorted(os.path.join(capture_dir, f) for f in os.listdir(capture_dir) if f.lower().endswith((".png", ".jpg", ".jpeg")))
+
+    results = VisualComparator(baseline_dir, diff_dir, update_baselines=update_baselines).compare_batch(captures)
+    for result in results:
+        print(f"{'PASS' if result.passed else 'FAIL'}: {result.name} - {result.status}, score {result.score:.6f}"
+              + (f", hash distance {result.hash_distance}" if result.hash_distance is not None else "")
+              + (f", diff {result.diff_image}" if result.diff_image else ""))
+    return 0 if all(result.passed for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+conftest.py registers the project-wide pytest command line options and plugins.
+"""
+
+from TestData.data import SwagLabsData
+from Utilities.command_counter import CommandBudgetPlugin
+from Utilities.latency_profile import latency_profiles
+from Utilities.result_stream import ResultStreamPlugin
+
+
+def pytest_addoption(parser):
+    """
+    Adds the custom command line options used by this project.
+    """
+    parser.addoption(
+        "--stream-report",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="Stream each test result to an append-only JSON Lines file (open it with Reports/viewer.html).",
+    )
+    parser.addoption(
+        "--real-keystrokes",
+        action="store_true",
+        default=False,
+        help="Type into form fields key by key instead of filling each form in one script call.",
+    )
+    parser.addoption(
+        "--browser-daemon",
+        action="store_true",
+        default=False,
+        help="Attach page objects to warm browsers of the local browser daemon (python -m Utilities.browser_daemon start).",
+    )
+    parser.addoption(
+        "--update-baselines",
+        action="store_true",
+        default=False,
+        help="Store missing or changed screenshots as the new visual baselines instead of failing.",
+    )
+    parser.addoption(
+        "--fixed-waits",
+        action="store_true",
+        default=False,
+        help="Use the hard-coded wait timeouts instead of the timeouts learned per user and action.",
+    )
+    parser.addoption(
+        "--excel-file",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="Excel workbook to read test data from and log results to, instead of SwagLabsData.excel_file.",
+    )
+    parser.addoption(
+        "--ddt-rows",
+        action="store",
+        default=None,
+        metavar="FIRST-LAST",
+        help="Only run these rows of the data-driven test sheet, e.g. 2-11.",
+    )
+
+
+def pytest_configure(config):
+    """
+    Registers the WebDriver command budget plugin and the optional plugins selected on the command line.
+    """
+    config.pluginmanager.register(CommandBudgetPlugin(), "command_budget")
+
+    if config.getoption("--real-keystrokes"):
+        SwagLabsData.real_keystrokes = True
+    if config.getoption("--browser-daemon"):
+        SwagLabsData.use_browser_daemon = True
+    if config.getoption("--update-baselines"):
+        SwagLabsData.update_baselines = True
+    if config.getoption("--fixed-waits"):
+        SwagLabsData.adaptive_waits = False
+    if config.getoption("--excel-file"):
+        SwagLabsData.excel_file = config.getoption("--excel-file")
+    if config.getoption("--ddt-rows"):
+        first_row, last_row = config.getoption("--ddt-rows").split("-")
+        SwagLabsData.ddt_first_row = int(first_row)
+        SwagLabsData.ddt_last_row = int(last_row)
+
+    stream_file = config.getoption("--stream-report")
+    if stream_file:
+        config.pluginmanager.register(ResultStreamPlugin(stream_file), "result_stream")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Saves the wait durations recorded during the run to the latency profiles.
+    """
+    latency_profiles.save()